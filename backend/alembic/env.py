@@ -13,6 +13,8 @@ from app.core.database import Base, DATABASE_URL
 from app.models.user import User  # Import all your models
 from app.models.user_settings import UserSettings
 from app.models.transaction import Transaction
+from app.models.monthly_rollup import MonthlyRollup
+from app.models.recurrence_rule import RecurrenceRule
 
 # Import other models as needed
 
@@ -0,0 +1,45 @@
+"""Add composite index for keyset pagination of transactions
+
+Revision ID: 5f2c8a1d9b34
+Revises: abc123def456
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5f2c8a1d9b34"
+down_revision: Union[str, Sequence[str], None] = "abc123def456"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX_NAME = "ix_transactions_user_date_created_id"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY can't run inside a transaction, and avoids locking writes
+    with op.get_context().autocommit_block():
+        op.create_index(
+            INDEX_NAME,
+            "transactions",
+            [
+                "user_id",
+                sa.text("date DESC"),
+                sa.text("created_at DESC"),
+                sa.text("id DESC"),
+            ],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            INDEX_NAME, table_name="transactions", postgresql_concurrently=True
+        )
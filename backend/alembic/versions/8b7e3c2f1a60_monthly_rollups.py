@@ -0,0 +1,55 @@
+"""Add monthly_rollups table
+
+Revision ID: 8b7e3c2f1a60
+Revises: 5f2c8a1d9b34
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8b7e3c2f1a60"
+down_revision: Union[str, Sequence[str], None] = "5f2c8a1d9b34"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "monthly_rollups",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("year", sa.Integer(), nullable=False),
+        sa.Column("month", sa.Integer(), nullable=False),
+        sa.Column("category", sa.String(length=100), nullable=False),
+        sa.Column("income", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("expense", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("count", sa.Integer(), nullable=False, server_default="0"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "year", "month", "category"),
+    )
+
+    # Backfill from existing transactions
+    op.execute(
+        """
+        INSERT INTO monthly_rollups (user_id, year, month, category, income, expense, count)
+        SELECT user_id,
+               CAST(EXTRACT(year FROM date) AS INTEGER),
+               CAST(EXTRACT(month FROM date) AS INTEGER),
+               category,
+               COALESCE(SUM(amount) FILTER (WHERE amount > 0), 0),
+               -COALESCE(SUM(amount) FILTER (WHERE amount < 0), 0),
+               COUNT(id)
+        FROM transactions
+        GROUP BY 1, 2, 3, 4
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("monthly_rollups")
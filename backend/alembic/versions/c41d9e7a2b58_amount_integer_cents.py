@@ -0,0 +1,80 @@
+"""Store transaction and rollup amounts as integer cents
+
+Revision ID: c41d9e7a2b58
+Revises: 8b7e3c2f1a60
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c41d9e7a2b58"
+down_revision: Union[str, Sequence[str], None] = "8b7e3c2f1a60"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # --- transactions.amount (float) -> transactions.amount_cents (bigint) ---
+    op.add_column("transactions", sa.Column("amount_cents", sa.BigInteger(), nullable=True))
+    op.execute(
+        "UPDATE transactions SET amount_cents = ROUND(CAST(amount AS NUMERIC) * 100)"
+    )
+    op.alter_column("transactions", "amount_cents", nullable=False)
+    op.drop_column("transactions", "amount")
+
+    # --- monthly_rollups: recompute in cents from the converted rows ---
+    op.add_column(
+        "monthly_rollups",
+        sa.Column("income_cents", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+    op.add_column(
+        "monthly_rollups",
+        sa.Column("expense_cents", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+    op.drop_column("monthly_rollups", "income")
+    op.drop_column("monthly_rollups", "expense")
+    op.execute("DELETE FROM monthly_rollups")
+    op.execute(
+        """
+        INSERT INTO monthly_rollups
+            (user_id, year, month, category, income_cents, expense_cents, count)
+        SELECT user_id,
+               CAST(EXTRACT(year FROM date) AS INTEGER),
+               CAST(EXTRACT(month FROM date) AS INTEGER),
+               category,
+               COALESCE(SUM(amount_cents) FILTER (WHERE amount_cents > 0), 0),
+               -COALESCE(SUM(amount_cents) FILTER (WHERE amount_cents < 0), 0),
+               COUNT(id)
+        FROM transactions
+        GROUP BY 1, 2, 3, 4
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column(
+        "monthly_rollups",
+        sa.Column("income", sa.Float(), nullable=False, server_default="0"),
+    )
+    op.add_column(
+        "monthly_rollups",
+        sa.Column("expense", sa.Float(), nullable=False, server_default="0"),
+    )
+    op.execute(
+        "UPDATE monthly_rollups SET income = income_cents / 100.0, "
+        "expense = expense_cents / 100.0"
+    )
+    op.drop_column("monthly_rollups", "expense_cents")
+    op.drop_column("monthly_rollups", "income_cents")
+
+    op.add_column("transactions", sa.Column("amount", sa.Float(), nullable=True))
+    op.execute("UPDATE transactions SET amount = amount_cents / 100.0")
+    op.alter_column("transactions", "amount", nullable=False)
+    op.drop_column("transactions", "amount_cents")
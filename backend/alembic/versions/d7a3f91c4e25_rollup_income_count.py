@@ -0,0 +1,51 @@
+"""Add income_count to monthly_rollups
+
+Revision ID: d7a3f91c4e25
+Revises: c41d9e7a2b58
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d7a3f91c4e25"
+down_revision: Union[str, Sequence[str], None] = "c41d9e7a2b58"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Number of income (positive) rows per bucket; expense count = count - this
+    op.add_column(
+        "monthly_rollups",
+        sa.Column("income_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.execute(
+        """
+        UPDATE monthly_rollups AS r
+        SET income_count = s.income_count
+        FROM (
+            SELECT user_id,
+                   CAST(EXTRACT(year FROM date) AS INTEGER) AS year,
+                   CAST(EXTRACT(month FROM date) AS INTEGER) AS month,
+                   category,
+                   COUNT(id) FILTER (WHERE amount_cents > 0) AS income_count
+            FROM transactions
+            GROUP BY 1, 2, 3, 4
+        ) AS s
+        WHERE r.user_id = s.user_id
+          AND r.year = s.year
+          AND r.month = s.month
+          AND r.category = s.category
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("monthly_rollups", "income_count")
@@ -0,0 +1,90 @@
+"""Add recurrence_rules and transactions.recurrence_rule_id
+
+Revision ID: e5b8c2a4f713
+Revises: d7a3f91c4e25
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e5b8c2a4f713"
+down_revision: Union[str, Sequence[str], None] = "d7a3f91c4e25"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "recurrence_rules",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("amount_cents", sa.BigInteger(), nullable=False),
+        sa.Column("description", sa.String(length=255), nullable=True),
+        sa.Column("category", sa.String(length=100), nullable=False),
+        sa.Column("transaction_type", sa.String(length=20), nullable=True),
+        sa.Column("location", sa.String(length=255), nullable=True),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.Column("interval_months", sa.Integer(), nullable=False),
+        sa.Column("day_of_month", sa.Integer(), nullable=False),
+        sa.Column("start_date", sa.Date(), nullable=False),
+        sa.Column("end_date", sa.Date(), nullable=True),
+        sa.Column("next_date", sa.Date(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_recurrence_rules_id"), "recurrence_rules", ["id"], unique=False
+    )
+    op.create_index(
+        op.f("ix_recurrence_rules_user_id"),
+        "recurrence_rules",
+        ["user_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_recurrence_rules_next_date_id",
+        "recurrence_rules",
+        ["next_date", "id"],
+        unique=False,
+    )
+
+    op.add_column(
+        "transactions", sa.Column("recurrence_rule_id", sa.Integer(), nullable=True)
+    )
+    op.create_foreign_key(
+        "transactions_recurrence_rule_id_fkey",
+        "transactions",
+        "recurrence_rules",
+        ["recurrence_rule_id"],
+        ["id"],
+        ondelete="SET NULL",
+    )
+    # NULLs are distinct: ordinary transactions are unaffected
+    op.create_unique_constraint(
+        "uq_transactions_recurrence_rule_date",
+        "transactions",
+        ["recurrence_rule_id", "date"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint(
+        "uq_transactions_recurrence_rule_date", "transactions", type_="unique"
+    )
+    op.drop_constraint(
+        "transactions_recurrence_rule_id_fkey", "transactions", type_="foreignkey"
+    )
+    op.drop_column("transactions", "recurrence_rule_id")
+    op.drop_index("ix_recurrence_rules_next_date_id", table_name="recurrence_rules")
+    op.drop_index(op.f("ix_recurrence_rules_user_id"), table_name="recurrence_rules")
+    op.drop_index(op.f("ix_recurrence_rules_id"), table_name="recurrence_rules")
+    op.drop_table("recurrence_rules")
@@ -0,0 +1,32 @@
+"""Add users.data_version
+
+Revision ID: f3c6a9d2e184
+Revises: e5b8c2a4f713
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f3c6a9d2e184"
+down_revision: Union[str, Sequence[str], None] = "e5b8c2a4f713"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Bumped with every write to the user's transactions; keys read caches
+    op.add_column(
+        "users",
+        sa.Column("data_version", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("users", "data_version")
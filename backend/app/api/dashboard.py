@@ -1,105 +1,123 @@
 # backend/app/api/dashboard.py
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, extract
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from sqlalchemy import select, func, and_
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, date
-from typing import Dict, List
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional
 
-from app.core.database import get_db
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.database import get_async_db
 from app.api.auth import get_current_user
 from app.models.user import User
 from app.models.transaction import Transaction
+from app.models.monthly_rollup import MonthlyRollup
+from app.services.analytics import analytics_cache, analytics_enabled
+from app.services.breakdown import Dimension, PeriodGranularity, breakdown
+from app.services.data_version import get_data_version
+from app.services.trends import (
+    MAX_TREND_BUCKETS,
+    Granularity,
+    count_buckets,
+    months_back,
+    trend_series,
+)
+from app.utils.http import etag_for, etag_response, render_json
+from app.utils.money import from_cents
 # from app.core.logger import logger
 
 
 router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
 
+# Rendered responses keyed by (endpoint, user, data version, params):
+# value is (etag, body). Writes bump the version in the DB, so entries never
+# go stale, in any worker; the TTL only ages out unused entries.
+dashboard_cache = LRUCache(
+    maxsize=settings.DASHBOARD_CACHE_MAX_SIZE,
+    ttl=settings.DASHBOARD_CACHE_TTL_SECONDS,
+)
+
+
+async def cached_response(
+    request: Request, key: Hashable, build: Callable[[], Awaitable[dict]]
+) -> Response:
+    """
+    Serve a dashboard response from the cache, building it on a miss.
+    A matching If-None-Match gets a 304; a hit costs only the version read.
+    """
+    entry = dashboard_cache.get(key)
+    if entry is None:
+        body = render_json(await build())
+        entry = (etag_for(body), body)
+        dashboard_cache.set(key, entry)
+    etag, body = entry
+    return etag_response(request, body, etag)
+
+
 @router.get("/summary")
 async def get_dashboard_summary(
-    db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
 ):
     """Get dashboard summary data for the current user"""
 
-    # Current month calculations
-    current_month = datetime.now().month
-    current_year = datetime.now().year
+    # The current month is part of the key: the summary rolls over with it.
+    # Read the version before querying, so cached data is never older than it.
+    now = datetime.now()
+    user_id: int = current_user.id  # type: ignore
+    version = await get_data_version(db, user_id)
+    key = ("summary", user_id, version, now.year, now.month)
+    return await cached_response(request, key, lambda: build_summary(db, user_id, now))
 
-    # Base query for current user's transactions
-    base_query = db.query(Transaction).filter(Transaction.user_id == current_user.id)
 
-    # Current month transactions
-    current_month_query = base_query.filter(
-        and_(
-            extract("month", Transaction.date) == current_month,
-            extract("year", Transaction.date) == current_year,
-        )
-    )
+async def build_summary(db: AsyncSession, user_id: int, now: datetime) -> dict:
+    # Current month calculations
+    current_month = now.month
+    current_year = now.year
 
-    # Calculate monthly totals
-    monthly_income = (
-        current_month_query.filter(Transaction.amount > 0)
-        .with_entities(func.coalesce(func.sum(Transaction.amount), 0))
-        .scalar()
-        or 0
-    )
+    if analytics_enabled():
+        columns = await analytics_cache.columns(db, user_id)
+        figures = columns.summary(current_year, current_month)
+    else:
+        figures = await summary_figures(db, user_id, current_year, current_month)
 
-    monthly_expenses = abs(
-        current_month_query.filter(Transaction.amount < 0)
-        .with_entities(func.coalesce(func.sum(Transaction.amount), 0))
-        .scalar()
-        or 0
-    )
+    # Calculate monthly totals (integer cents - exact)
+    monthly_income = figures["monthly_income"]
+    monthly_expenses = figures["monthly_expenses"]
 
     monthly_balance = monthly_income - monthly_expenses
 
-    # Overall totals (all time)
-    total_income = (
-        base_query.filter(Transaction.amount > 0)
-        .with_entities(func.coalesce(func.sum(Transaction.amount), 0))
-        .scalar()
-        or 0
-    )
-
-    total_expenses = abs(
-        base_query.filter(Transaction.amount < 0)
-        .with_entities(func.coalesce(func.sum(Transaction.amount), 0))
-        .scalar()
-        or 0
-    )
-
-    # Transaction count
-    total_transactions = base_query.count()
-
     # Recent transactions (last 5)
     recent_transactions = (
-        base_query.order_by(Transaction.date.desc(), Transaction.created_at.desc())
-        .limit(5)
-        .all()
-    )
-
-    # Category breakdown for current month (expenses only)
-    category_spending = (
-        current_month_query.filter(Transaction.amount < 0)
-        .with_entities(
-            Transaction.category, func.sum(func.abs(Transaction.amount)).label("total")
+        await db.execute(
+            select(Transaction)
+            .where(Transaction.user_id == user_id)
+            .order_by(Transaction.date.desc(), Transaction.created_at.desc())
+            .limit(5)
         )
-        .group_by(Transaction.category)
-        .order_by(func.sum(func.abs(Transaction.amount)).desc())
-        .all()
-    )
+    ).scalars().all()
 
     return {
         "monthly_summary": {
-            "income": round(monthly_income, 2),
-            "expenses": round(monthly_expenses, 2),
-            "balance": round(monthly_balance, 2),
+            "income": from_cents(monthly_income),
+            "expenses": from_cents(monthly_expenses),
+            "balance": from_cents(monthly_balance),
             "month": current_month,
             "year": current_year,
         },
         "overall_summary": {
-            "total_income": round(total_income, 2),
-            "total_expenses": round(total_expenses, 2),
-            "total_transactions": total_transactions,
+            "total_income": from_cents(figures["total_income"]),
+            "total_expenses": from_cents(figures["total_expenses"]),
+            "total_transactions": figures["total_transactions"],
         },
         "recent_transactions": [
             {
@@ -113,61 +131,222 @@ async def get_dashboard_summary(
             for t in recent_transactions
         ],
         "category_breakdown": [
-            {"category": category, "amount": round(float(total), 2)}
-            for category, total in category_spending
+            {"category": category, "amount": from_cents(total)}
+            for category, total in figures["category_spending"]
         ],
     }
 
 
+async def summary_figures(
+    db: AsyncSession, user_id: int, current_year: int, current_month: int
+) -> dict:
+    """Summary totals in cents, from SQL (see UserColumns.summary)"""
+    # Totals come from the monthly rollups: O(months), not O(transactions)
+    user_rollups = MonthlyRollup.user_id == user_id
+    in_current_month = and_(
+        MonthlyRollup.year == current_year, MonthlyRollup.month == current_month
+    )
+
+    def sum_of(column, *conditions):
+        aggregate = func.sum(column)
+        if conditions:
+            aggregate = aggregate.filter(*conditions)
+        return func.coalesce(aggregate, 0)
+
+    # All scalar totals in a single pass
+    totals = (
+        await db.execute(
+            select(
+                sum_of(MonthlyRollup.income_cents, in_current_month).label(
+                    "monthly_income"
+                ),
+                sum_of(MonthlyRollup.expense_cents, in_current_month).label(
+                    "monthly_expenses"
+                ),
+                sum_of(MonthlyRollup.income_cents).label("total_income"),
+                sum_of(MonthlyRollup.expense_cents).label("total_expenses"),
+                sum_of(MonthlyRollup.count).label("total_transactions"),
+            ).where(user_rollups)
+        )
+    ).one()
+
+    # Category breakdown for current month (expenses only)
+    category_spending = (
+        await db.execute(
+            select(MonthlyRollup.category, MonthlyRollup.expense_cents)
+            .where(user_rollups, in_current_month, MonthlyRollup.expense_cents > 0)
+            .order_by(MonthlyRollup.expense_cents.desc())
+        )
+    ).all()
+
+    return {
+        "monthly_income": totals.monthly_income,
+        "monthly_expenses": totals.monthly_expenses,
+        "total_income": totals.total_income,
+        "total_expenses": totals.total_expenses,
+        "total_transactions": int(totals.total_transactions),
+        "category_spending": [tuple(row) for row in category_spending],
+    }
+
+
 @router.get("/monthly-trends")
 async def get_monthly_trends(
-    months: int = 6,
-    db: Session = Depends(get_db),
+    request: Request,
+    months: int = Query(
+        6,
+        ge=1,
+        le=MAX_TREND_BUCKETS,
+        description="Window size when `from` is omitted",
+    ),
+    granularity: Granularity = Query("month"),
+    start: Optional[date] = Query(None, alias="from"),
+    end: Optional[date] = Query(None, alias="to"),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Get monthly income/expense trends for the last N months"""
-
-    # Get monthly aggregates
-    monthly_data = (
-        db.query(
-            extract("year", Transaction.date).label("year"),
-            extract("month", Transaction.date).label("month"),
-            func.coalesce(
-                func.sum(
-                    func.case([(Transaction.amount > 0, Transaction.amount)], else_=0)
-                ),
-                0,
-            ).label("income"),
-            func.coalesce(
-                func.abs(
-                    func.sum(
-                        func.case(
-                            [(Transaction.amount < 0, Transaction.amount)], else_=0
-                        )
-                    )
-                ),
-                0,
-            ).label("expenses"),
+    """
+    Get income/expense trends, one zero-filled point per bucket.
+
+    The window is `from`..`to` (default: today), or the last N months
+    (including the current one) when `from` is omitted.
+    """
+    end = end or date.today()
+    try:
+        start = start or months_back(end, months)
+    except ValueError:  # Before year 1
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="`months` reaches too far back",
+        )
+    if start > end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="`from` is after `to`"
         )
-        .filter(Transaction.user_id == current_user.id)
-        .group_by(extract("year", Transaction.date), extract("month", Transaction.date))
-        .order_by(
-            extract("year", Transaction.date).desc(),
-            extract("month", Transaction.date).desc(),
+    if count_buckets(start, end, granularity) > MAX_TREND_BUCKETS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Window too large: at most {MAX_TREND_BUCKETS} buckets",
         )
-        .limit(months)
-        .all()
+
+    user_id: int = current_user.id  # type: ignore
+    version = await get_data_version(db, user_id)
+    key = ("trends", user_id, version, granularity, start, end)
+    return await cached_response(
+        request, key, lambda: build_trends(db, user_id, start, end, granularity)
     )
 
+
+async def build_trends(
+    db: AsyncSession,
+    user_id: int,
+    start: date,
+    end: date,
+    granularity: Granularity,
+) -> dict:
+    if analytics_enabled():
+        columns = await analytics_cache.columns(db, user_id)
+        series = columns.trend_series(start, end, granularity)
+    else:
+        series = await trend_series(db, user_id, start, end, granularity)
     return {
+        "granularity": granularity,
+        "from": start.isoformat(),
+        "to": end.isoformat(),
         "trends": [
             {
-                "year": int(row.year),
-                "month": int(row.month),
-                "income": round(float(row.income), 2),
-                "expenses": round(float(row.expenses), 2),
-                "balance": round(float(row.income) - float(row.expenses), 2),
+                "period": bucket.isoformat(),
+                "year": bucket.year,
+                "month": bucket.month,
+                "income": from_cents(income),
+                "expenses": from_cents(expenses),
+                "balance": from_cents(income - expenses),
+            }
+            for bucket, income, expenses in series
+        ],
+    }
+
+
+@router.get("/breakdown")
+async def get_breakdown(
+    request: Request,
+    group_by: List[Dimension] = Query(..., description="One or two dimensions"),
+    granularity: PeriodGranularity = Query("month", description="For `period`"),
+    start: Optional[date] = Query(None, alias="from"),
+    end: Optional[date] = Query(None, alias="to"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Income, expenses, net, count and average amount per group, grouped by
+    one or two of category, location, transaction_type and period.
+
+    Served from the monthly rollups when possible (no location, periods of
+    a month or longer, `from`/`to` on month boundaries), or from the
+    in-memory analytics engine when ANALYTICS_ENGINE=numpy.
+    """
+    dimensions = tuple(dict.fromkeys(group_by))
+    if not 1 <= len(dimensions) <= 2:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="group_by takes one or two distinct dimensions",
+        )
+    if start and end and start > end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="`from` is after `to`"
+        )
+
+    user_id: int = current_user.id  # type: ignore
+    key = (
+        "breakdown",
+        user_id,
+        await get_data_version(db, user_id),
+        dimensions,
+        granularity,
+        start,
+        end,
+    )
+    return await cached_response(
+        request,
+        key,
+        lambda: build_breakdown(db, user_id, dimensions, granularity, start, end),
+    )
+
+
+async def build_breakdown(db, user_id, dimensions, granularity, start, end) -> dict:
+    if analytics_enabled():
+        columns = await analytics_cache.columns(db, user_id)
+        groups, source, truncated = columns.breakdown(
+            dimensions, granularity, start, end
+        )
+    else:
+        groups, source, truncated = await breakdown(
+            db, user_id, dimensions, granularity, start, end
+        )
+    return {
+        "group_by": list(dimensions),
+        "granularity": granularity if "period" in dimensions else None,
+        "from": start.isoformat() if start else None,
+        "to": end.isoformat() if end else None,
+        "source": source,
+        "truncated": truncated,
+        "groups": [
+            {
+                **{
+                    dimension: group[dimension].isoformat()
+                    if dimension == "period"
+                    else group[dimension]
+                    for dimension in dimensions
+                },
+                "income": from_cents(group["income_cents"]),
+                "expenses": from_cents(group["expense_cents"]),
+                "net": from_cents(group["net_cents"]),
+                "count": group["count"],
+                # Average transaction size, regardless of direction
+                "average": from_cents(
+                    (group["income_cents"] + group["expense_cents"]) // group["count"]
+                ),
             }
-            for row in reversed(monthly_data)
-        ]
+            for group in groups
+        ],
     }
+
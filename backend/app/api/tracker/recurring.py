@@ -0,0 +1,69 @@
+# backend/app/api/tracker/recurring.py
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+
+from app.core.database import get_async_db
+from app.api.auth import get_current_user
+from app.models.user import User
+from app.models.recurrence_rule import RecurrenceRule
+from app.services.recurrence import new_rule
+from app.schemas.transaction import RecurrenceRuleCreate, RecurrenceRuleResponse
+
+router = APIRouter(prefix="/api/recurring", tags=["recurring"])
+
+
+@router.post("/", response_model=RecurrenceRuleResponse)
+async def create_recurrence_rule(
+    rule: RecurrenceRuleCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Create a recurrence rule. Its occurrences are materialized as
+    transactions by the background scheduler, including any already due.
+    """
+    db_rule = new_rule(rule, current_user.id)  # type: ignore
+    db.add(db_rule)
+    await db.commit()
+    await db.refresh(db_rule)
+    return db_rule
+
+
+@router.get("/", response_model=List[RecurrenceRuleResponse])
+async def get_recurrence_rules(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Get the current user's recurrence rules"""
+    result = await db.execute(
+        select(RecurrenceRule)
+        .where(RecurrenceRule.user_id == current_user.id)
+        .order_by(RecurrenceRule.id)
+    )
+    return result.scalars().all()
+
+
+@router.delete("/{rule_id}")
+async def delete_recurrence_rule(
+    rule_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Stop a recurrence; transactions already created are kept"""
+    result = await db.execute(
+        select(RecurrenceRule).where(
+            RecurrenceRule.id == rule_id, RecurrenceRule.user_id == current_user.id
+        )
+    )
+    db_rule = result.scalar_one_or_none()
+    if not db_rule:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Recurrence rule not found"
+        )
+
+    await db.delete(db_rule)
+    await db.commit()
+
+    return {"message": "Recurrence rule deleted successfully"}
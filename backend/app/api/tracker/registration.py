@@ -2,11 +2,19 @@ from fastapi import APIRouter, Depends, HTTPException, status, Request
 from pydantic import BaseModel, EmailStr, validator
 from typing import Optional
 import re
-from app.core.sanitize.sanitize_module import sanitize_input
-from app.core.sanitize.sanitize_utils import sanitize_field
+from app.core.sanitize.sanitize_utils import sanitize_model
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
+# Field -> sanitizer policy; both passwords get the same treatment so the
+# confirmation compares like with like
+REGISTER_SANITIZE_POLICIES = {
+    "full_name": "name",
+    "email": "identifier",
+    "password": "password",
+    "confirm_password": "password",
+}
+
 
 class RegisterRequest(BaseModel):
     full_name: str
@@ -19,54 +27,39 @@ class RegisterRequest(BaseModel):
         if not v.strip():
             raise ValueError("Full name cannot be empty")
 
-        # Use your sanitizer with context about the field
-        context = {"field": "full_name", "validator": "RegisterRequest"}
-        sanitized_name = sanitize_field(v, "full_name", context)
-
-        # Additional validation after sanitization
-        if len(sanitized_name) < 2:
+        if len(v) < 2:
             raise ValueError("Full name must be at least 2 characters long")
-        if len(sanitized_name) > 100:
+        if len(v) > 100:
             raise ValueError("Full name cannot exceed 100 characters")
 
-        return sanitized_name
+        return v
 
     @validator("email")
     def validate_email(cls, v):
-        # Sanitize email
-        context = {"field": "email", "validator": "RegisterRequest"}
-        sanitized_email = sanitize_field(v, "email", context)
-
         # Additional email validation if needed
-        if not re.match(
-            r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$", sanitized_email
-        ):
+        if not re.match(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$", v):
             raise ValueError("Please enter a valid email address")
 
-        return sanitized_email
+        return v
 
     @validator("password")
     def validate_password(cls, v):
-        # Sanitize password (minimal sanitization)
-        context = {"field": "password", "validator": "RegisterRequest"}
-        sanitized_password = sanitize_field(v, "password", context)
-
         # Password strength validation
-        if len(sanitized_password) < 8:
+        if len(v) < 8:
             raise ValueError("Password must be at least 8 characters long")
-        if not re.search(r"[a-z]", sanitized_password):
+        if not re.search(r"[a-z]", v):
             raise ValueError("Password must contain at least one lowercase letter")
-        if not re.search(r"[A-Z]", sanitized_password):
+        if not re.search(r"[A-Z]", v):
             raise ValueError("Password must contain at least one uppercase letter")
-        if not re.search(r"\d", sanitized_password):
+        if not re.search(r"\d", v):
             raise ValueError("Password must contain at least one number")
 
         # Check for common weak passwords
         weak_passwords = ["password", "12345678", "qwertyui", "letmein"]
-        if sanitized_password.lower() in weak_passwords:
+        if v.lower() in weak_passwords:
             raise ValueError("Password is too common")
 
-        return sanitized_password
+        return v
 
     @validator("confirm_password")
     def validate_confirm_password(cls, v, values):
@@ -84,16 +77,19 @@ async def register_user(register_data: RegisterRequest, request: Request):
         # Add request context to logging
         client_host = request.client.host if request.client else "unknown"
         user_agent = request.headers.get("user-agent", "unknown")
-
-        # Final sanitization with request context
         context = {
             "endpoint": "/auth/register",
             "client_ip": client_host,
             "user_agent": user_agent,
         }
 
-        final_full_name = sanitize_field(register_data.full_name, "full_name", context)
-        final_email = sanitize_field(register_data.email, "email", context)
+        # One sanitizer pass (and at most one log record) for the whole
+        # payload, then the validators again on the sanitized values
+        sanitized = sanitize_model(register_data, REGISTER_SANITIZE_POLICIES, context)
+        register_data = RegisterRequest.model_validate(sanitized.model_dump())
+
+        final_full_name = register_data.full_name
+        final_email = register_data.email
 
         # Check if email already exists in database
         # if await email_exists(final_email):
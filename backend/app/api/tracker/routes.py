@@ -1,66 +1,121 @@
 # backend/app/api/tracker/routes.py
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, and_, extract
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, desc, and_, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Literal, Optional
 import datetime
 
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.api.auth import get_current_user
 from app.models.user import User
 from app.models.transaction import Transaction
+from app.services.analytics import analytics_cache
+from app.services.batch import MissingTransactions, apply_batch
+from app.services.data_version import bump_data_version
+from app.services.exporter import stream_export
+from app.services.importer import (
+    import_transactions,
+    iter_csv_records,
+    iter_lines,
+    iter_ndjson_records,
+)
+from app.services.recurrence import rule_for_transaction, sync_recurrence
+from app.services.rollups import add_to_rollups, remove_from_rollups
+from app.utils.http import PrecomputedJSON
+from app.utils.dates import start_of_day
+from app.utils.money import signed_cents
+from app.utils.pagination import encode_cursor, decode_cursor
 from app.schemas.transaction import (
     TransactionCreate,
     TransactionUpdate,
     TransactionResponse,
+    TransactionListAdapter,
+    TransactionBatch,
+    TransactionBatchResult,
     QuickAddTemplate,
     EXPENSE_CATEGORIES,
     INCOME_CATEGORIES,
+    QUICK_ADD_TEMPLATES,
 )
 
 router = APIRouter(prefix="/api/transactions", tags=["transactions"])
 
 
-def get_user_transaction(
-    db: Session, transaction_id: int, user_id: int
+async def get_user_transaction(
+    db: AsyncSession, transaction_id: int, user_id: int, for_update: bool = False
 ) -> Optional[Transaction]:
-    """Get a transaction that belongs to the specified user"""
-    return (
-        db.query(Transaction)
-        .filter(and_(Transaction.id == transaction_id, Transaction.user_id == user_id))
-        .first()
+    """
+    Get a transaction that belongs to the specified user. for_update locks the
+    row until commit, so concurrent writes to it take turns (their rollup
+    deltas must see each other's committed values) and a second delete of
+    the same row finds nothing.
+    """
+    query = select(Transaction).where(
+        and_(Transaction.id == transaction_id, Transaction.user_id == user_id)
     )
+    if for_update:
+        query = query.with_for_update()
+    result = await db.execute(query)
+    return result.scalars().first()
+
+
+def apply_transaction_filters(
+    query,
+    category: Optional[str] = None,
+    transaction_type: Optional[str] = None,
+    start_date: Optional[datetime.date] = None,
+    end_date: Optional[datetime.date] = None,
+):
+    """Apply the optional list filters shared by listing and export"""
+    if category:
+        query = query.where(Transaction.category == category)
+    if transaction_type:
+        query = query.where(Transaction.transaction_type == transaction_type)
+    if start_date:
+        query = query.where(Transaction.date >= start_of_day(start_date))
+    if end_date:
+        query = query.where(Transaction.date <= start_of_day(end_date))
+    return query
 
 
 @router.post("/", response_model=TransactionResponse)
 async def create_transaction(
     transaction: TransactionCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Create a new transaction"""
-    # Get the amount as float and apply sign based on transaction type
-    amount_value = float(transaction.amount)
-    if transaction.transaction_type == "expense" and amount_value > 0:
-        amount_value = -amount_value
-    elif transaction.transaction_type == "income" and amount_value < 0:
-        amount_value = abs(amount_value)
-
+    """Create a new transaction (is_recurring also starts a monthly recurrence)"""
+    rule_id = None
+    if transaction.is_recurring:
+        # This transaction is the rule's first occurrence; the scheduler
+        # materializes the following ones
+        rule = rule_for_transaction(transaction, current_user.id)  # type: ignore
+        db.add(rule)
+        await db.flush()
+        rule_id = rule.id
+
+    # Store exact cents, signed based on transaction type
     db_transaction = Transaction(
-        amount=amount_value,
+        amount_cents=signed_cents(transaction.amount, transaction.transaction_type),
         description=transaction.description,
         category=transaction.category,
-        date=transaction.date,
+        date=start_of_day(transaction.date),
         transaction_type=transaction.transaction_type,
         location=transaction.location,
         notes=transaction.notes,
         is_recurring=transaction.is_recurring,
+        recurrence_rule_id=rule_id,
         user_id=current_user.id,  # type: ignore
     )
 
     db.add(db_transaction)
-    db.commit()
-    db.refresh(db_transaction)
+    await db.flush()
+    await add_to_rollups(db, [db_transaction.id])  # type: ignore
+    version = await bump_data_version(db, current_user.id)  # type: ignore
+    await db.commit()
+    await analytics_cache.sync(db, current_user.id, version, [db_transaction.id])  # type: ignore
+    await db.refresh(db_transaction)
 
     return db_transaction
 
@@ -73,41 +128,157 @@ async def get_transactions(
     transaction_type: Optional[str] = Query(None),
     start_date: Optional[datetime.date] = Query(None),
     end_date: Optional[datetime.date] = Query(None),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor"),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Get user's transactions with optional filtering"""
-    query = db.query(Transaction).filter(Transaction.user_id == current_user.id)  # type: ignore
+    """
+    Get user's transactions with optional filtering.
+
+    Pages either with skip/limit or, for deep pages, with the opaque cursor
+    returned in the X-Next-Cursor header (keyset pagination).
+    """
+    if cursor and skip:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Use either skip or cursor, not both",
+        )
+
+    query = select(Transaction).where(Transaction.user_id == current_user.id)  # type: ignore
 
     # Apply filters
-    if category:
-        query = query.filter(Transaction.category == category)
-    if transaction_type:
-        query = query.filter(Transaction.transaction_type == transaction_type)
-    if start_date:
-        query = query.filter(Transaction.date >= start_date)
-    if end_date:
-        query = query.filter(Transaction.date <= end_date)
+    query = apply_transaction_filters(
+        query, category, transaction_type, start_date, end_date
+    )
+
+    # Keyset: continue strictly after the last row of the previous page
+    if cursor:
+        try:
+            last_key = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+            )
+        query = query.where(
+            tuple_(Transaction.date, Transaction.created_at, Transaction.id)
+            < tuple_(*last_key)
+        )
 
-    # Order by date (most recent first) and apply pagination
-    transactions = (
-        query.order_by(desc(Transaction.date), desc(Transaction.created_at))
+    # Order by date (most recent first) and apply pagination.
+    # Matches ix_transactions_user_date_created_id so no sort step is needed.
+    result = await db.execute(
+        query.order_by(
+            desc(Transaction.date), desc(Transaction.created_at), desc(Transaction.id)
+        )
         .offset(skip)
         .limit(limit)
-        .all()
     )
+    transactions = result.scalars().all()
+
+    # A full page means there may be more rows
+    headers = {}
+    if transactions and len(transactions) == limit:
+        last = transactions[-1]
+        headers["X-Next-Cursor"] = encode_cursor(
+            last.date, last.created_at, last.id  # type: ignore
+        )
 
-    return transactions
+    # Validate the rows and dump them to JSON bytes in one pydantic-core pass,
+    # instead of model objects -> jsonable_encoder -> json.dumps
+    body = TransactionListAdapter.dump_json(
+        TransactionListAdapter.validate_python(transactions, from_attributes=True)
+    )
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/export")
+async def export_transactions(
+    format: Literal["csv", "ndjson"] = Query("csv"),
+    category: Optional[str] = Query(None),
+    transaction_type: Optional[str] = Query(None),
+    start_date: Optional[datetime.date] = Query(None),
+    end_date: Optional[datetime.date] = Query(None),
+    current_user: User = Depends(get_current_user),
+):
+    """Stream all of the user's transactions (same filters as the list) as CSV or NDJSON"""
+    query = apply_transaction_filters(
+        select(Transaction).where(Transaction.user_id == current_user.id),  # type: ignore
+        category,
+        transaction_type,
+        start_date,
+        end_date,
+    )
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        stream_export(query, format),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="transactions.{format}"'
+        },
+    )
+
+
+@router.post("/import")
+async def import_transactions_file(
+    request: Request,
+    format: Literal["csv", "ndjson"] = Query("csv"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Bulk import transactions from a raw CSV or NDJSON request body.
+
+    The body is streamed and validated in batches against TransactionCreate.
+    Valid rows are inserted with multi-row INSERTs; invalid rows are reported
+    by row number and skipped. CSV needs a header row with the field names.
+    A line or CSV record over IMPORT_MAX_RECORD_BYTES is reported and skipped.
+    is_recurring is stored as given but starts no recurrence rule.
+    """
+    lines = iter_lines(request.stream())
+    records = iter_csv_records(lines) if format == "csv" else iter_ndjson_records(lines)
+    result = await import_transactions(db, records, current_user.id)  # type: ignore
+    if result["imported"]:
+        analytics_cache.invalidate(current_user.id)  # type: ignore
+    return {"format": format, **result}
+
+
+@router.post("/batch", response_model=TransactionBatchResult)
+async def batch_transactions(
+    batch: TransactionBatch,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Apply a list of creates, updates and deletes atomically: either all of
+    them succeed or none does (404 if any id to update or delete is not the
+    user's). Set-based statements and a single commit for the whole batch.
+    """
+    try:
+        created, updated, deleted = await apply_batch(db, current_user.id, batch)  # type: ignore
+    except MissingTransactions as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Transactions not found: {e.ids}",
+        )
+    changed = [t.id for t in created] + [t.id for t in updated] + deleted
+    if changed:
+        version = await bump_data_version(db, current_user.id)  # type: ignore
+    await db.commit()
+
+    if changed:
+        await analytics_cache.sync(db, current_user.id, version, changed)  # type: ignore
+    return {"created": created, "updated": updated, "deleted": deleted}
 
 
 @router.get("/{transaction_id}", response_model=TransactionResponse)
 async def get_transaction(
     transaction_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get a specific transaction"""
-    transaction = get_user_transaction(db, transaction_id, current_user.id)  # type: ignore
+    transaction = await get_user_transaction(db, transaction_id, current_user.id)  # type: ignore
     if not transaction:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Transaction not found"
@@ -119,11 +290,13 @@ async def get_transaction(
 async def update_transaction(
     transaction_id: int,
     transaction_update: TransactionUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """Update a transaction"""
-    db_transaction = get_user_transaction(db, transaction_id, current_user.id)  # type: ignore
+    db_transaction = await get_user_transaction(
+        db, transaction_id, current_user.id, for_update=True  # type: ignore
+    )
     if not db_transaction:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Transaction not found"
@@ -131,30 +304,39 @@ async def update_transaction(
 
     # Update fields that are provided
     update_data = transaction_update.dict(exclude_unset=True)
+    if update_data.get("date") is not None:
+        update_data["date"] = start_of_day(update_data["date"])
 
     # Handle amount and transaction_type update
     if "amount" in update_data or "transaction_type" in update_data:
         # Get current values safely
-        current_amount = getattr(db_transaction, "amount", 0.0)  # type: ignore
+        current_amount = db_transaction.amount
         current_type = getattr(db_transaction, "transaction_type", "expense")  # type: ignore
 
         # Get new values
-        new_amount = update_data.get("amount", abs(float(current_amount)))
+        new_amount = update_data.pop("amount", None)
+        if new_amount is None:
+            new_amount = current_amount
         new_type = update_data.get("transaction_type", current_type)
 
         # Apply correct sign
-        amount_value = abs(float(new_amount))
-        if new_type == "expense":
-            amount_value = -amount_value
+        update_data["amount_cents"] = signed_cents(new_amount, new_type)
 
-        update_data["amount"] = amount_value
+    # Take the old values out of the rollups before they change
+    await remove_from_rollups(db, [transaction_id])
 
     # Update the transaction
     for field, value in update_data.items():
         setattr(db_transaction, field, value)
+    if "is_recurring" in update_data:
+        await sync_recurrence(db, db_transaction)
 
-    db.commit()
-    db.refresh(db_transaction)
+    await db.flush()
+    await add_to_rollups(db, [transaction_id])
+    version = await bump_data_version(db, current_user.id)  # type: ignore
+    await db.commit()
+    await analytics_cache.sync(db, current_user.id, version, [transaction_id])  # type: ignore
+    await db.refresh(db_transaction)
 
     return db_transaction
 
@@ -162,78 +344,53 @@ async def update_transaction(
 @router.delete("/{transaction_id}")
 async def delete_transaction(
     transaction_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """Delete a transaction"""
-    db_transaction = get_user_transaction(db, transaction_id, current_user.id)  # type: ignore
+    db_transaction = await get_user_transaction(
+        db, transaction_id, current_user.id, for_update=True  # type: ignore
+    )
     if not db_transaction:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Transaction not found"
         )
 
-    db.delete(db_transaction)
-    db.commit()
+    await remove_from_rollups(db, [transaction_id])
+    await db.delete(db_transaction)
+    version = await bump_data_version(db, current_user.id)  # type: ignore
+    await db.commit()
+    await analytics_cache.sync(db, current_user.id, version, [transaction_id])  # type: ignore
 
     return {"message": "Transaction deleted successfully"}
 
 
-@router.get("/categories/list")
-async def get_categories():
-    """Get available categories for transactions"""
-    return {
+# Static content: encoded once at import, served as bytes with a strong ETag
+CATEGORIES_RESPONSE = PrecomputedJSON(
+    {
         "expense_categories": EXPENSE_CATEGORIES,
         "income_categories": INCOME_CATEGORIES,
     }
+)
+QUICK_ADD_TEMPLATES_RESPONSE = PrecomputedJSON(QUICK_ADD_TEMPLATES)
+
+
+@router.get("/categories/list")
+async def get_categories(request: Request):
+    """Get available categories for transactions"""
+    return CATEGORIES_RESPONSE.response(request)
 
 
 @router.get("/templates/quick-add")
-async def get_quick_add_templates():
+async def get_quick_add_templates(request: Request):
     """Get predefined templates for quick transaction entry"""
-    templates = [
-        {
-            "name": "Coffee",
-            "amount": 4.50,
-            "category": "Food & Dining",
-            "description": "Coffee",
-            "transaction_type": "expense",
-        },
-        {
-            "name": "Lunch",
-            "amount": 12.00,
-            "category": "Food & Dining",
-            "description": "Lunch",
-            "transaction_type": "expense",
-        },
-        {
-            "name": "Gas",
-            "amount": 40.00,
-            "category": "Transportation",
-            "description": "Gas fill-up",
-            "transaction_type": "expense",
-        },
-        {
-            "name": "Groceries",
-            "amount": 75.00,
-            "category": "Groceries",
-            "description": "Grocery shopping",
-            "transaction_type": "expense",
-        },
-        {
-            "name": "Salary",
-            "amount": 3000.00,
-            "category": "Salary",
-            "description": "Monthly salary",
-            "transaction_type": "income",
-        },
-    ]
-    return templates
+    return QUICK_ADD_TEMPLATES_RESPONSE.response(request)
 
 
 @router.post("/quick-add")
 async def quick_add_transaction(
     template: QuickAddTemplate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """Quickly add a transaction using a template"""
@@ -24,9 +24,57 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # --- Password Hashing ---
+    BCRYPT_ROUNDS: int = 12  # Changing it rehashes passwords on next login
+    PASSWORD_HASH_WORKERS: int = 4  # Max concurrent hash/verify operations
+
+    # --- Authenticated User Cache ---
+    USER_CACHE_MAX_SIZE: int = 1024  # 0 disables the cache
+    USER_CACHE_TTL_SECONDS: float = 60.0
+
+    # --- Metrics ---
+    # Exposes cache and pool stats at /api/health/metrics (signed-in users only)
+    METRICS_ENABLED: bool = False
+
+    # --- Dashboard Response Cache ---
+    DASHBOARD_CACHE_MAX_SIZE: int = 2048  # 0 disables the cache
+    # Writes invalidate immediately in every worker (users.data_version);
+    # this only ages out entries nobody asks for
+    DASHBOARD_CACHE_TTL_SECONDS: float = 300.0
+
+    # --- In-Memory Analytics Engine ---
+    # "sql" or "numpy" (needs numpy installed; falls back to SQL without it)
+    ANALYTICS_ENGINE: str = "sql"
+    ANALYTICS_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # Across all users
+
+    # --- Bulk Import ---
+    # Longest line / CSV record buffered; longer ones fail as a row error
+    IMPORT_MAX_RECORD_BYTES: int = 64 * 1024
+
+    # --- Recurring Transactions ---
+    # Every worker runs the scheduler; SKIP LOCKED splits the due rules
+    RECURRENCE_SCHEDULER_ENABLED: bool = True
+    RECURRENCE_SCHEDULER_INTERVAL_SECONDS: float = 300.0
+    RECURRENCE_BATCH_SIZE: int = 1000  # Rules per claim/insert/commit
+
     # --- Database Configuration ---
     DATABASE_URL: str = os.getenv("DATABASE_URL", "")
 
+    # --- Connection Pool (per engine, per worker process) ---
+    # Peak connections per worker = 2 engines * (DB_POOL_SIZE + DB_MAX_OVERFLOW);
+    # keep workers * that below Postgres max_connections.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0  # Seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # Seconds before a connection is replaced, -1 = never
+    # True: test each connection on checkout (extra round trip, pessimistic).
+    # False: rely on DB_POOL_RECYCLE and reconnect on error (optimistic).
+    DB_POOL_PRE_PING: bool = True
+    # Session TimeZone of both engines; calendar days (rollups, trends,
+    # export) follow it. Set it to the server's former TimeZone if existing
+    # rows were written under a non-UTC one.
+    DB_TIMEZONE: str = "UTC"
+
     # --- CORS Configuration ---
     # Accept both string and list, convert to list in validator
     ALLOWED_ORIGINS: Union[str, List[str]] = os.getenv(
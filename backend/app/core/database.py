@@ -1,6 +1,12 @@
 # backend/app/core/database.py
 import os
-from sqlalchemy import create_engine
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy import create_engine, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -24,16 +30,117 @@ def get_database_url():
     return settings.DATABASE_URL
 
 
+def get_async_database_url(url: str) -> str:
+    """Swap the sync driver in a PostgreSQL URL for asyncpg."""
+    scheme, sep, rest = url.partition("://")
+    if not sep:
+        return url
+    dialect = scheme.split("+", 1)[0]
+    if dialect in ("postgresql", "postgres"):
+        return f"postgresql+asyncpg://{rest}"
+    return url
+
+
+class PoolWaitStats:
+    """Counters for how long checkouts waited for a pooled connection"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        waits = self.checkouts + self.timeouts
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "avg_wait_ms": round(self.total_wait / waits * 1000, 3) if waits else 0.0,
+            "max_wait_ms": round(self.max_wait * 1000, 3),
+        }
+
+
+class _WaitTimingMixin:
+    """Times the wait for a connection (the part that grows when saturated)"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()  # type: ignore[misc]
+        except exc.TimeoutError:
+            self.wait_stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.wait_stats.record(time.perf_counter() - start)
+        return connection
+
+
+class InstrumentedQueuePool(_WaitTimingMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_WaitTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_options() -> Dict[str, Any]:
+    """create_engine pool arguments from Settings"""
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
 DATABASE_URL = get_database_url()
+ASYNC_DATABASE_URL = get_async_database_url(DATABASE_URL)
 
+# Sync engine - used by scripts, Alembic and the remaining sync routes
 engine = create_engine(
     DATABASE_URL,
-    pool_pre_ping=True,  # Check connection before using
+    poolclass=InstrumentedQueuePool,
+    **pool_options(),
+    # Same session TimeZone as the async engine (see app/utils/dates.py)
+    connect_args={"options": f"-c timezone={settings.DB_TIMEZONE}"},
     echo=False,  # Set to False in production
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine - used by the async API routes so queries don't block the event loop
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    poolclass=InstrumentedAsyncQueuePool,
+    **pool_options(),
+    # Pinned, so SQL day casts don't depend on the server's TimeZone
+    connect_args={"server_settings": {"timezone": settings.DB_TIMEZONE}},
+    echo=False,
+)
+
+
+# expire_on_commit=False: attributes can't be lazy-loaded after commit in async code
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 Base = declarative_base()
 import app.models
 
@@ -44,3 +151,33 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Dependency to get an async DB session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def pool_status() -> Dict[str, Any]:
+    """Live connection pool usage for both engines"""
+
+    def describe(pool) -> Dict[str, Any]:
+        status = {
+            "pool_size": pool.size(),
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": pool.overflow(),
+            "timeout_seconds": settings.DB_POOL_TIMEOUT,
+            "recycle_seconds": settings.DB_POOL_RECYCLE,
+            "pre_ping": settings.DB_POOL_PRE_PING,
+        }
+        if isinstance(pool, _WaitTimingMixin):
+            status["waits"] = pool.wait_stats.snapshot()
+        return status
+
+    return {
+        "async": describe(async_engine.sync_engine.pool),
+        "sync": describe(engine.pool),
+    }
@@ -0,0 +1,146 @@
+# log_handlers.py
+import logging
+import queue
+import threading
+import time
+from collections import OrderedDict
+from logging.handlers import QueueListener
+from typing import Hashable, Optional
+
+
+class BatchedFileHandler(logging.FileHandler):
+    """
+    FileHandler that flushes every `flush_every` records or `flush_interval`
+    seconds instead of after every record. Meant to run on a QueueListener
+    thread; FlushingQueueListener flushes it whenever the queue goes idle.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        mode: str = "a",
+        encoding: Optional[str] = None,
+        *,
+        flush_every: int = 100,
+        flush_interval: float = 1.0,
+    ):
+        super().__init__(filename, mode=mode, encoding=encoding)
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+            self._pending += 1
+            if (
+                self._pending >= self.flush_every
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            ):
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        super().flush()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+
+class FlushingQueueListener(QueueListener):
+    """
+    QueueListener that flushes its handlers once the queue has been empty
+    for `idle_flush_seconds`, and on stop(), so batched records never sit
+    unwritten while nothing else is being logged.
+    """
+
+    def __init__(self, log_queue, *handlers, idle_flush_seconds: float = 0.5):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.idle_flush_seconds = idle_flush_seconds
+
+    def dequeue(self, block: bool):
+        while True:
+            try:
+                return self.queue.get(
+                    block, self.idle_flush_seconds if block else None
+                )
+            except queue.Empty:
+                # _monitor treats Empty as "stop", so only raise it when polling
+                if not block:
+                    raise
+                self.flush()
+
+    def flush(self) -> None:
+        for handler in self.handlers:
+            handler.flush()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            super().stop()
+        self.flush()
+
+
+class RepeatedEventFilter(logging.Filter):
+    """
+    Rate-limits identical events per source.
+
+    Records carrying an `event_key` attribute (pass it via `extra=`) are let
+    through `max_per_window` times per `window_seconds`; further repeats are
+    dropped and counted. The first record after the window rolls over notes
+    how many were suppressed. Records without an event_key always pass.
+    Tracks at most `max_keys` keys (least recently seen are forgotten).
+    """
+
+    def __init__(
+        self,
+        max_per_window: int = 5,
+        window_seconds: float = 60.0,
+        max_keys: int = 10000,
+    ):
+        super().__init__()
+        self.max_per_window = max_per_window
+        self.window_seconds = window_seconds
+        self.max_keys = max_keys
+        # key -> [window_start, count, suppressed]
+        self._events: "OrderedDict[Hashable, list]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.suppressed_total = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = getattr(record, "event_key", None)
+        if key is None or self.max_per_window <= 0:
+            return True
+        try:
+            hash(key)
+        except TypeError:
+            return True
+
+        now = time.monotonic()
+        with self._lock:
+            event = self._events.get(key)
+            if event is None or now - event[0] >= self.window_seconds:
+                suppressed = event[2] if event is not None else 0
+                self._events[key] = [now, 1, 0]
+                self._events.move_to_end(key)
+                while len(self._events) > self.max_keys:
+                    self._events.popitem(last=False)
+                if suppressed:
+                    record.msg = (
+                        f"{record.getMessage()} | Suppressed {suppressed} "
+                        f"identical events in the previous {self.window_seconds:g}s"
+                    )
+                    record.args = None
+                return True
+
+            self._events.move_to_end(key)
+            if event[1] < self.max_per_window:
+                event[1] += 1
+                return True
+            event[2] += 1
+            self.suppressed_total += 1
+            return False
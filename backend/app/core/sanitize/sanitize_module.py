@@ -1,23 +1,46 @@
 # sanitize_module.py
 
+import atexit
 import logging
 import os
+import queue
 import re
+import time
 import unicodedata
 import html
 from html import unescape
 from urllib.parse import unquote_plus
+from logging.handlers import QueueHandler
 from typing import Optional, Dict, Any, Tuple, List
 
+from app.core.cache import LRUCache
+from .log_handlers import (
+    BatchedFileHandler,
+    FlushingQueueListener,
+    RepeatedEventFilter,
+)
+
 # === Logging Setup ===
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 LOG_FILE_PATH = os.path.join(SCRIPT_DIR, "..", "suspicious_input.log")
 
+# Identical suspicious events from one source are logged at most
+# SANITIZER_LOG_RATE_LIMIT times per SANITIZER_LOG_WINDOW_SECONDS (0 = no limit)
+SANITIZER_LOG_RATE_LIMIT = int(os.getenv("SANITIZER_LOG_RATE_LIMIT", "5"))
+SANITIZER_LOG_WINDOW_SECONDS = float(os.getenv("SANITIZER_LOG_WINDOW_SECONDS", "60"))
+
+# Context keys that identify where an event came from
+EVENT_SOURCE_KEYS = ("client_ip", "endpoint", "source", "field", "param_name")
+
 logger = logging.getLogger("InputSanitizer")
 logger.setLevel(logging.WARNING)
 
+# Callers only enqueue records; a background thread formats and writes them
+# and flushes in batches, so a flood of payloads never blocks on disk I/O.
+log_listener = None
+
 if not logger.handlers:
-    file_handler = logging.FileHandler(LOG_FILE_PATH, mode="a", encoding="utf-8")
+    file_handler = BatchedFileHandler(LOG_FILE_PATH, mode="a", encoding="utf-8")
     file_handler.setLevel(logging.WARNING)
 
     console_handler = logging.StreamHandler()
@@ -27,8 +50,19 @@ if not logger.handlers:
     file_handler.setFormatter(formatter)
     console_handler.setFormatter(formatter)
 
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.addFilter(
+        RepeatedEventFilter(
+            max_per_window=SANITIZER_LOG_RATE_LIMIT,
+            window_seconds=SANITIZER_LOG_WINDOW_SECONDS,
+        )
+    )
+    log_listener = FlushingQueueListener(log_queue, file_handler, console_handler)
+    log_listener.start()
+    atexit.register(log_listener.stop)
+
+    logger.addHandler(queue_handler)
     logger.propagate = False
     logger.warning("Logger initialized - log file location: " + LOG_FILE_PATH)
 
@@ -77,10 +111,208 @@ SUSPICIOUS_PATTERNS = [
 SUSPICIOUS_PATTERNS.sort(key=lambda x: x[1], reverse=True)
 
 
+# === Linear-time equivalents of the backtracking-prone rules ===
+# Each returns exactly what re.search(pattern, text, DOTALL | IGNORECASE)
+# would, but in O(len(text)): `A.*?B` only needs the earliest A followed by
+# any later B, so it is split into two forward searches.
+_I = re.IGNORECASE
+_SQL_CLAUSE_HEAD = re.compile(r"\b(select|union)", _I)
+_SQL_CLAUSE_TAIL = re.compile(r"from|where|join", _I)
+_SCRIPT_OPEN = re.compile(r"<script", _I)
+_SCRIPT_CLOSE = re.compile(r"</script>", _I)
+_IFRAME = re.compile(r"<iframe", _I)
+_IMG = re.compile(r"<img", _I)
+_ONERROR = re.compile(r"onerror", _I)
+# Whole word runs followed by `\s*=`; the lookbehind allows one start per run
+_WORD_BEFORE_EQUALS = re.compile(r"(?<!\w)\w+(?=\s*=)")
+_ON = re.compile(r"on", _I)
+
+
+def _sql_clause(text: str) -> bool:
+    # (?i)\b(select|union).+?(from|where|join)
+    head = _SQL_CLAUSE_HEAD.search(text)
+    return bool(head) and bool(_SQL_CLAUSE_TAIL.search(text, head.end() + 1))
+
+
+def _sql_comment(text: str) -> bool:
+    # --|#|/\*.*?\*/
+    if "--" in text or "#" in text:
+        return True
+    start = text.find("/*")
+    return start >= 0 and text.find("*/", start + 2) >= 0
+
+
+def _script_tag(text: str) -> bool:
+    # (?i)<script[^>]*>.*?</script>
+    tag = _SCRIPT_OPEN.search(text)
+    if not tag:
+        return False
+    close = text.find(">", tag.end())
+    return close >= 0 and bool(_SCRIPT_CLOSE.search(text, close + 1))
+
+
+def _event_handler(text: str) -> bool:
+    # (?i)on\w+\s*=  -> "on" inside a word run (not as its last char) before =
+    for run in _WORD_BEFORE_EQUALS.finditer(text):
+        if _ON.search(text, run.start(), run.end() - 1):
+            return True
+    return False
+
+
+def _iframe_img(text: str) -> bool:
+    # (?i)<iframe|<img.*?onerror
+    if _IFRAME.search(text):
+        return True
+    img = _IMG.search(text)
+    return bool(img) and bool(_ONERROR.search(text, img.end()))
+
+
+LINEAR_MATCHERS = {
+    r"(?i)\b(select|union).+?(from|where|join)": _sql_clause,
+    r"--|#|/\*.*?\*/": _sql_comment,
+    r"(?i)<script[^>]*>.*?</script>": _script_tag,
+    r"(?i)on\w+\s*=": _event_handler,
+    r"(?i)<iframe|<img.*?onerror": _iframe_img,
+}
+
+MATCH_MODES = ("linear", "regex")
+DEFAULT_MATCH_MODE = os.getenv("SANITIZER_MATCH_MODE", "linear")
+
+# Score returned when a scan runs out of budget - treated as hostile
+SCAN_BUDGET_EXCEEDED_SCORE = 20
+
+
+# Memoized results, keyed by (stripped value, options). 0 disables the cache;
+# longer values are rarely repeated and would only churn it.
+SANITIZER_CACHE_SIZE = int(os.getenv("SANITIZER_CACHE_SIZE", "4096"))
+SANITIZER_CACHE_MAX_VALUE_LENGTH = int(
+    os.getenv("SANITIZER_CACHE_MAX_VALUE_LENGTH", "256")
+)
+
+sanitizer_cache = LRUCache(maxsize=SANITIZER_CACHE_SIZE)
+
+
+class ScanBudgetExceeded(Exception):
+    pass
+
+
+class PatternScanner:
+    """
+    SUSPICIOUS_PATTERNS compiled once, plus a combined pre-filter.
+
+    The combined regex is an alternation of every rule, so a clean input is
+    rejected in a single scan. Only when it hits are the individual rules
+    evaluated (an alternation can't report overlapping hits of several rules).
+
+    mode="linear" swaps the rules in LINEAR_MATCHERS for their linear-time
+    equivalents (and leaves them out of the pre-filter), so the worst case is
+    bounded by input length. mode="regex" runs every rule as a plain regex.
+    """
+
+    FLAGS = re.DOTALL | re.IGNORECASE
+
+    def __init__(self, patterns):
+        self.rules = [
+            (re.compile(pattern, self.FLAGS), pattern, severity, desc)
+            for pattern, severity, desc in patterns
+        ]
+        self.combined = self._combine(pattern for pattern, _, _ in patterns)
+        self.safe_combined = self._combine(
+            pattern for pattern, _, _ in patterns if pattern not in LINEAR_MATCHERS
+        )
+        self.regex_rules = [
+            (regex.search, pattern, severity, desc)
+            for regex, pattern, severity, desc in self.rules
+        ]
+        self.linear_rules = [
+            (LINEAR_MATCHERS.get(pattern, regex.search), pattern, severity, desc)
+            for regex, pattern, severity, desc in self.rules
+        ]
+        self.linear_only = [
+            LINEAR_MATCHERS[pattern]
+            for pattern, _, _ in patterns
+            if pattern in LINEAR_MATCHERS
+        ]
+        self.sql_keyword_boost = re.compile(
+            r"\b(update|drop|select|insert|delete)\b", re.I
+        )
+
+    def _combine(self, patterns):
+        # Inline (?i) is only allowed at the start of a regex; FLAGS covers it
+        return re.compile(
+            "|".join(f"(?:{pattern.removeprefix('(?i)')})" for pattern in patterns),
+            self.FLAGS,
+        )
+
+    def _any_match(self, normalized: str, mode: str) -> bool:
+        if mode == "regex":
+            return bool(self.combined.search(normalized))
+        return bool(self.safe_combined.search(normalized)) or any(
+            match(normalized) for match in self.linear_only
+        )
+
+    def scan(
+        self,
+        normalized: str,
+        mode: str = DEFAULT_MATCH_MODE,
+        budget_ms: Optional[float] = None,
+    ) -> Tuple[int, List[Tuple[str, int, str]]]:
+        """
+        Score already-normalized text. Same results in both modes.
+
+        With budget_ms, scanning stops once the budget is spent (checked
+        between rules) and fails closed with SCAN_BUDGET_EXCEEDED_SCORE.
+        """
+        if mode not in MATCH_MODES:
+            raise ValueError(f"Unknown match mode: {mode!r}")
+        deadline = (
+            time.perf_counter() + budget_ms / 1000 if budget_ms is not None else None
+        )
+        try:
+            return self._scan(normalized, mode, deadline)
+        except ScanBudgetExceeded:
+            return SCAN_BUDGET_EXCEEDED_SCORE, [
+                (
+                    "scan_budget_exceeded",
+                    SCAN_BUDGET_EXCEEDED_SCORE,
+                    "Scan budget exceeded (fail closed)",
+                )
+            ]
+
+    def _scan(self, normalized, mode, deadline):
+        if not self._any_match(normalized, mode):
+            # No rule matches; the boost needs a SQL keyword, which is a rule
+            return 0, []
+
+        rules = self.linear_rules if mode == "linear" else self.regex_rules
+        matched = []
+        score = 0
+        for match, pattern, severity, desc in rules:
+            if deadline is not None and time.perf_counter() > deadline:
+                raise ScanBudgetExceeded()
+            if match(normalized):
+                score += severity
+                matched.append((pattern, severity, desc))
+
+        # Contextual boost: SQL keyword + comment
+        has_comment = "--" in normalized or "#" in normalized or "/*" in normalized
+        if has_comment and self.sql_keyword_boost.search(normalized):
+            score += 2
+            matched.append(("contextual_boost", 2, "-- + SQL keyword boost"))
+
+        return score, matched
+
+
+scanner = PatternScanner(SUSPICIOUS_PATTERNS)
+
+
 def normalize_payload(text: str) -> str:
     """
     Normalize common encodings to detect obfuscated payloads.
     """
+    # Nothing to decode: unquote_plus only touches '%' and '+', unescape '&'
+    if "%" not in text and "+" not in text and "&" not in text:
+        return text
     # Decode URL encoding
     text = unquote_plus(text)
     # Decode HTML entities
@@ -88,7 +320,12 @@ def normalize_payload(text: str) -> str:
     return text
 
 
-def calculate_total_score(text: str) -> Tuple[int, List[Tuple[str, int, str]]]:
+def calculate_total_score(
+    text: str,
+    *,
+    match_mode: str = DEFAULT_MATCH_MODE,
+    scan_budget_ms: Optional[float] = None,
+) -> Tuple[int, List[Tuple[str, int, str]]]:
     """
     Analyze text for suspicious patterns and return total score and matches.
     """
@@ -96,27 +333,23 @@ def calculate_total_score(text: str) -> Tuple[int, List[Tuple[str, int, str]]]:
         return 0, []
 
     # Normalize payload before scoring
-    normalized = normalize_payload(text)
+    return scanner.scan(normalize_payload(text), match_mode, scan_budget_ms)
 
-    matched = []
-    score = 0
 
-    for pattern, severity, desc in SUSPICIOUS_PATTERNS:
-        if re.search(pattern, normalized, re.DOTALL | re.IGNORECASE):
-            score += severity
-            matched.append((pattern, severity, desc))
+# Greek, Cyrillic, Armenian and Arabic - scripts with Latin look-alikes
+_NON_LATIN_SCRIPT = re.compile(r"[\u0370-\u04FF\u0530-\u058F\u0600-\u06FF]")
+_ASCII_LETTER = re.compile(r"[a-zA-Z]")
 
-    # Contextual boost: SQL keyword + comment
-    has_sql_kw = any(
-        re.search(p, normalized, re.I)
-        for p in [r"\b(update|drop|select|insert|delete)\b"]
-    )
-    has_comment = bool(re.search(r"--|#|/\*", normalized))
-    if has_sql_kw and has_comment:
-        score += 2
-        matched.append(("contextual_boost", 2, "-- + SQL keyword boost"))
+# Characters kept when allow_unicode=False: up to Latin Extended-B, plus spaces
+_OUTSIDE_LATIN = re.compile(r"[^\x00-\u024F\s]")
+_CONTROL_CHARS = re.compile(r"[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]")
+_WHITESPACE_RUN = re.compile(r"\s+")
 
-    return score, matched
+# remove_specials policies as str.translate deletion tables
+SPECIALS_TABLES = {
+    "strict": str.maketrans("", "", '"\'\\<>`|;&$()[]{}'),
+    "balanced": str.maketrans("", "", "\\<>`|;&$"),
+}
 
 
 def detect_script_mix(text: str) -> bool:
@@ -124,16 +357,58 @@ def detect_script_mix(text: str) -> bool:
     Detect mixed scripts (e.g., Latin + Cyrillic) – possible homoglyph attack.
     Allows Latin with diacritics (e.g., Lithuanian: ąčęėįšųū).
     """
-    cyrillic = re.compile(r"[\u0400-\u04FF]")
-    other_scripts = re.compile(r"[\u0370-\u03FF\u0530-\u058F\u0600-\u06FF]")
+    if text.isascii():
+        return False
+    return bool(_NON_LATIN_SCRIPT.search(text)) and bool(_ASCII_LETTER.search(text))
 
-    has_cyrillic = bool(cyrillic.search(text))
-    has_other_script = bool(other_scripts.search(text))
 
-    if (has_cyrillic or has_other_script) and re.search(r"[a-zA-Z]", text):
-        return True
+def _safe_log_text(text: str) -> str:
+    return (
+        repr(text)
+        .replace("\\n", "\\\\n")
+        .replace("\\r", "\\\\r")
+        .replace("\\t", "\\\\t")
+    )
 
-    return False
+
+def _log_suspicious(log_msg: str, event, context: Optional[Dict[str, Any]]) -> None:
+    if context:  # This now handles None properly
+        log_msg += f" | Context={context}"
+        source = tuple(context.get(key) for key in EVENT_SOURCE_KEYS)
+    else:
+        source = None
+    logger.warning(log_msg, extra={"event_key": (source, event)})
+
+
+def log_suspicious_input(
+    normalized_text: str,
+    total_score: int,
+    matched_patterns: List[Tuple[str, int, str]],
+    context: Optional[Dict[str, Any]] = None,
+) -> None:
+    log_msg = f"Suspicious input detected: {_safe_log_text(normalized_text)} | Score={total_score} | Matches={[desc for _, _, desc in matched_patterns]}"
+    _log_suspicious(log_msg, (normalized_text, total_score), context)
+
+
+def log_suspicious_fields(
+    findings: Dict[str, Tuple[str, int, List[Tuple[str, int, str]]]],
+    context: Optional[Dict[str, Any]] = None,
+) -> None:
+    """
+    Log several suspicious fields of one payload as a single record.
+    findings maps field name -> (normalized_text, score, matched_patterns).
+    """
+    inputs = ", ".join(
+        f"{field}={_safe_log_text(text)}" for field, (text, _, _) in findings.items()
+    )
+    total_score = sum(score for _, score, _ in findings.values())
+    matches = {
+        field: [desc for _, _, desc in matched_patterns]
+        for field, (_, _, matched_patterns) in findings.items()
+    }
+    log_msg = f"Suspicious input detected: {inputs} | Score={total_score} | Matches={matches}"
+    event = tuple((field, text, score) for field, (text, score, _) in findings.items())
+    _log_suspicious(log_msg, event, context)
 
 
 def sanitize_input(
@@ -146,9 +421,16 @@ def sanitize_input(
     log_suspicious: bool = True,
     max_length: int = 5000,  # Prevent DoS
     context: Optional[Dict[str, Any]] = None,  # Fixed: Optional type hint
+    match_mode: str = DEFAULT_MATCH_MODE,  # "linear" (ReDoS-safe) or "regex"
+    scan_budget_ms: Optional[float] = None,  # Fail closed past this scan time
+    use_cache: bool = True,
 ) -> Tuple[str, int, List[Tuple[str, int, str]]]:
     """
     Enhanced input sanitizer with scoring, normalization, and logging.
+
+    Results for short values are memoized in sanitizer_cache. Logging is not
+    part of the cached result: a suspicious hit is logged on every call, with
+    that call's context.
     """
     if not isinstance(text, str):
         return "", 0, []
@@ -162,11 +444,36 @@ def sanitize_input(
     if not original_text:
         return "", 0, []
 
+    cache_key = None
+    if (
+        use_cache
+        and sanitizer_cache.maxsize > 0
+        and len(original_text) <= SANITIZER_CACHE_MAX_VALUE_LENGTH
+    ):
+        cache_key = (
+            original_text,
+            allow_unicode,
+            escape_html,
+            compress_whitespace,
+            remove_specials,
+            match_mode,
+        )
+        cached = sanitizer_cache.get(cache_key)
+        if cached is not None:
+            sanitized, total_score, matched_patterns, normalized_text = cached
+            if log_suspicious and total_score > 0:
+                log_suspicious_input(
+                    normalized_text, total_score, matched_patterns, context
+                )
+            return sanitized, total_score, list(matched_patterns)
+
     # === 1. Normalize Payload ===
     normalized_text = normalize_payload(original_text)
 
     # === 2. Calculate Score ===
-    total_score, matched_patterns = calculate_total_score(normalized_text)
+    total_score, matched_patterns = calculate_total_score(
+        normalized_text, match_mode=match_mode, scan_budget_ms=scan_budget_ms
+    )
 
     # === 3. Detect Mixed Scripts ===
     if detect_script_mix(normalized_text):
@@ -177,67 +484,38 @@ def sanitize_input(
 
     # === 4. Log Suspicious Input ===
     if log_suspicious and total_score > 0:
-        safe_log_text = (
-            repr(normalized_text)
-            .replace("\\n", "\\\\n")
-            .replace("\\r", "\\\\r")
-            .replace("\\t", "\\\\t")
-        )
-        log_msg = f"Suspicious input detected: {safe_log_text} | Score={total_score} | Matches={[desc for _, _, desc in matched_patterns]}"
-        if context:  # This now handles None properly
-            log_msg += f" | Context={context}"
-        logger.warning(log_msg)
-        for handler in logger.handlers:
-            handler.flush()
+        log_suspicious_input(normalized_text, total_score, matched_patterns, context)
 
     # === 5. Sanitization Pipeline ===
     text = original_text
 
     # Unicode handling
     if not allow_unicode:
-        allowed_chars = []
-        for char in text:
-            code_point = ord(char)
-            if (code_point <= 0x024F) or char.isspace():
-                allowed_chars.append(char)
-        text = "".join(allowed_chars)
+        if not text.isascii():
+            text = _OUTSIDE_LATIN.sub("", text)
     else:
         text = unicodedata.normalize("NFC", text)
 
     # Remove control characters
-    text = re.sub(r"[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]", "", text)
+    text = _CONTROL_CHARS.sub("", text)
 
     if compress_whitespace:
-        text = re.sub(r"\s+", " ", text).strip()
-
-    # Remove special characters based on policy
-    if remove_specials == "strict":
-        dangerous_chars = [
-            '"',
-            "'",
-            "\\",
-            "<",
-            ">",
-            "`",
-            "|",
-            ";",
-            "&",
-            "$",
-            "(",
-            ")",
-            "[",
-            "]",
-            "{",
-            "}",
-        ]
-        for char in dangerous_chars:
-            text = text.replace(char, "")
-    elif remove_specials == "balanced":
-        dangerous_chars = ["\\", "<", ">", "`", "|", ";", "&", "$"]
-        for char in dangerous_chars:
-            text = text.replace(char, "")
+        text = _WHITESPACE_RUN.sub(" ", text).strip()
+
+    # Remove special characters based on policy ("none" keeps them)
+    specials_table = SPECIALS_TABLES.get(remove_specials)
+    if specials_table is not None:
+        text = text.translate(specials_table)
 
     if escape_html:
         text = html.escape(text)
 
+    # A budget failure depends on timing, not on the value - don't memoize it
+    if cache_key is not None and not (
+        matched_patterns and matched_patterns[0][0] == "scan_budget_exceeded"
+    ):
+        sanitizer_cache.set(
+            cache_key, (text, total_score, tuple(matched_patterns), normalized_text)
+        )
+
     return text, total_score, matched_patterns
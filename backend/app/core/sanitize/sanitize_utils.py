@@ -1,6 +1,57 @@
 # sanitize_utils.py
-from typing import Optional, Dict, Any
-from sanitize_module import sanitize_input
+from typing import Optional, Dict, Any, Mapping, TypeVar
+
+from pydantic import BaseModel
+
+from .sanitize_module import (
+    log_suspicious_fields,
+    normalize_payload,
+    sanitize_input,
+)
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# sanitize_input options per policy
+POLICIES: Dict[str, Dict[str, Any]] = {
+    # For names, allow unicode but be strict about special characters
+    "name": {
+        "allow_unicode": True,
+        "escape_html": False,
+        "remove_specials": "strict",
+    },
+    # For emails and usernames, be more permissive with special chars
+    "identifier": {
+        "allow_unicode": False,  # Email should be ASCII
+        "escape_html": False,
+        "remove_specials": "balanced",
+    },
+    # For passwords, minimal sanitization (just remove control chars)
+    "password": {
+        "allow_unicode": False,
+        "escape_html": False,
+        "remove_specials": "none",  # Passwords need special chars
+    },
+    # Default sanitization for other fields
+    "default": {
+        "allow_unicode": True,
+        "escape_html": True,  # Escape HTML by default
+        "remove_specials": "balanced",
+    },
+}
+
+# Field name -> policy, for fields not covered by an explicit policy map
+FIELD_POLICIES: Dict[str, str] = {
+    "full_name": "name",
+    "name": "name",
+    "title": "name",
+    "email": "identifier",
+    "username": "identifier",
+    "password": "password",
+}
+
+
+def policy_for(field_name: str) -> str:
+    return FIELD_POLICIES.get(field_name, "default")
 
 
 def sanitize_field(
@@ -16,51 +67,75 @@ def sanitize_field(
     # Ensure context is never None - provide empty dict as fallback
     safe_context = context or {}
 
-    # Configure sanitization based on field type
-    if field_name in ["full_name", "name", "title"]:
-        # For names, allow unicode but be strict about special characters
-        sanitized, score, matches = sanitize_input(
-            value,
-            allow_unicode=True,
-            escape_html=False,
-            remove_specials="strict",
-            log_suspicious=True,
-            context=safe_context,
-        )
-    elif field_name in ["email", "username"]:
-        # For emails and usernames, be more permissive with special chars
-        sanitized, score, matches = sanitize_input(
-            value,
-            allow_unicode=False,  # Email should be ASCII
-            escape_html=False,
-            remove_specials="balanced",
-            log_suspicious=True,
-            context=safe_context,
-        )
-    elif field_name == "password":
-        # For passwords, minimal sanitization (just remove control chars)
-        sanitized, score, matches = sanitize_input(
-            value,
-            allow_unicode=False,
-            escape_html=False,
-            remove_specials="none",  # Passwords need special chars
-            log_suspicious=True,
-            context=safe_context,
-        )
-    else:
-        # Default sanitization for other fields
-        sanitized, score, matches = sanitize_input(
-            value,
-            allow_unicode=True,
-            escape_html=True,  # Escape HTML by default
-            remove_specials="balanced",
-            log_suspicious=True,
-            context=safe_context,
-        )
+    sanitized, score, matches = sanitize_input(
+        value,
+        log_suspicious=True,
+        context=safe_context,
+        **POLICIES[policy_for(field_name)],
+    )
 
     # Optionally handle high scores (you might want to reject the request)
     if score > 5:  # Threshold for highly suspicious input
         # Log or take action for highly suspicious input
         pass
 
-    return sanitized
\ No newline at end of file
+    return sanitized
+
+
+def sanitize_many(
+    data: Mapping[str, Any],
+    policies: Optional[Mapping[str, str]] = None,
+    context: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Sanitize every string field of a payload in one call.
+
+    policies maps field name -> policy name (a key of POLICIES); only those
+    fields are sanitized. Without it, every string field is, using
+    FIELD_POLICIES. Suspicious fields are logged together as one record
+    with the given context. Returns a new dict; other values pass through.
+    """
+    sanitized_data = dict(data)
+    if policies is None:
+        policies = {field: policy_for(field) for field in data}
+
+    findings = {}
+    for field, policy in policies.items():
+        value = data.get(field)
+        if not value or not isinstance(value, str):
+            continue
+        options = POLICIES[policy]
+        sanitized, score, matches = sanitize_input(
+            value, log_suspicious=False, **options
+        )
+        sanitized_data[field] = sanitized
+        if score > 0:
+            # sanitize_input scores the truncated, stripped, decoded value
+            max_length = options.get("max_length", 5000)
+            normalized = normalize_payload(value[:max_length].strip())
+            findings[field] = (normalized, score, matches)
+
+    if findings:
+        log_suspicious_fields(findings, {**(context or {}), "fields": list(findings)})
+
+    return sanitized_data
+
+
+def sanitize_model(
+    model: ModelT,
+    policies: Optional[Mapping[str, str]] = None,
+    context: Optional[Dict[str, Any]] = None,
+) -> ModelT:
+    """
+    sanitize_many over a Pydantic model's fields; returns an updated copy
+    (not re-validated).
+    """
+    fields = model.model_dump(include=set(policies) if policies is not None else None)
+    sanitized = sanitize_many(fields, policies, context)
+    return model.model_copy(
+        update={
+            field: value
+            for field, value in sanitized.items()
+            if isinstance(fields[field], str)
+        }
+    )
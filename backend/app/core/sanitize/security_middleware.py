@@ -1,33 +1,50 @@
 # security_middleware.py
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
 from .sanitize_module import sanitize_input
 
 
-class SanitizationMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        # Sanitize query parameters
-        if request.query_params:
-            sanitized_query_params = {}
-            for key, value in request.query_params.items():
-                context = {"source": "query_param", "param_name": key}
-                sanitized_value, score, matches = sanitize_input(
-                    value,
-                    allow_unicode=True,
-                    escape_html=True,
-                    remove_specials="balanced",
-                    log_suspicious=True,
-                    context=context,
-                )
-                sanitized_query_params[key] = sanitized_value
-
-            # Replace query params with sanitized versions
-            request.scope["query_string"] = "&".join(
-                [f"{k}={v}" for k, v in sanitized_query_params.items()]
-            ).encode()
+def sanitize_query_string(query_string: bytes) -> bytes:
+    """
+    Sanitize every query parameter value and re-encode the query string.
+
+    Decoded the same way Starlette's Request does it; repeated keys and blank
+    values are preserved.
+    """
+    sanitized_query_params = []
+    params = parse_qsl(query_string.decode("latin-1"), keep_blank_values=True)
+    for key, value in params:
+        context = {"source": "query_param", "param_name": key}
+        sanitized_value, score, matches = sanitize_input(
+            value,
+            allow_unicode=True,
+            escape_html=True,
+            remove_specials="balanced",
+            log_suspicious=True,
+            context=context,
+        )
+        sanitized_query_params.append((key, sanitized_value))
+    return urlencode(sanitized_query_params).encode("latin-1")
+
+
+class SanitizationMiddleware:
+    """
+    Raw ASGI middleware: rewrites the query string of HTTP requests that have
+    one and passes everything else through untouched, so responses (including
+    streaming ones) go straight from the app to the server.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope.get("query_string"):
+            scope = dict(scope)
+            scope["query_string"] = sanitize_query_string(scope["query_string"])
 
         # For form data, we'll rely on the Pydantic validation
         # For JSON bodies, we'll rely on the Pydantic validation
 
-        response = await call_next(request)
-        return response
+        await self.app(scope, receive, send)
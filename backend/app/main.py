@@ -1,23 +1,46 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import Depends, FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
 from app.api.tracker.routes import router as tracker_router
-from app.api.dashboard import router as dashboard_router
-from app.core.config import settings
+from app.api.tracker.recurring import router as recurring_router
+from app.api.dashboard import router as dashboard_router, dashboard_cache
+from app.core.config import settings as core_settings
+from app.core.database import pool_status
+from app.core.sanitize.sanitize_module import sanitizer_cache
+from app.services.analytics import analytics_cache
+from app.services.recurrence import recurrence_scheduler
 from app.core.debugger import debugger  # import the instance, not the class
 from app.settings import settings
 
-from app.api.auth import router as auth_router
+from app.api.auth import router as auth_router, get_current_user, user_cache
 from app.api.settings import router as settings_router
 
 # Test request model
 class TestRequest(BaseModel):
     test: str
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Background materialization of recurring transactions
+    async with recurrence_scheduler():
+        yield
+
+
 def create_app():
     # Create the FastAPI app instance
-    app = FastAPI(title="FinanceTracker API", version="1.0.0")
+    # orjson renders every JSON response; list endpoints that matter dump
+    # straight to bytes with pydantic (see get_transactions)
+    app = FastAPI(
+        title="FinanceTracker API",
+        version="1.0.0",
+        default_response_class=ORJSONResponse,
+        lifespan=lifespan,
+    )
 
     # Parse allowed origins properly
     allowed_origins = settings.ALLOWED_ORIGINS
@@ -39,6 +62,7 @@ def create_app():
     # Include routers
     app.include_router(auth_router)
     app.include_router(tracker_router)
+    app.include_router(recurring_router)
     app.include_router(dashboard_router)
     app.include_router(settings_router, prefix="/api")
 
@@ -53,6 +77,23 @@ def create_app():
     async def health_check():
         return {"status": "healthy", "service": "LifeSync Finance API"}
 
+    # Cache and pool internals: opt-in, and only for signed-in users
+    if core_settings.METRICS_ENABLED:
+
+        @app.get(
+            "/api/health/metrics",
+            tags=["Health"],
+            dependencies=[Depends(get_current_user)],
+        )
+        async def health_metrics():
+            return {
+                "user_cache": user_cache.stats(),
+                "sanitizer_cache": sanitizer_cache.stats(),
+                "dashboard_cache": dashboard_cache.stats(),
+                "analytics_cache": analytics_cache.stats(),
+                "db_pool": pool_status(),
+            }
+
     @app.post("/api/health", tags=["Health"])
     async def health_check_post(request: TestRequest):
         return {
@@ -1,3 +1,5 @@
 from .user import User
 from .transaction import Transaction
-from .user_settings import UserSettings
\ No newline at end of file
+from .user_settings import UserSettings
+from .monthly_rollup import MonthlyRollup
+from .recurrence_rule import RecurrenceRule
\ No newline at end of file
@@ -0,0 +1,26 @@
+# backend/app/models/monthly_rollup.py
+from sqlalchemy import Column, Integer, BigInteger, String, ForeignKey
+from app.core.database import Base
+
+
+class MonthlyRollup(Base):
+    """Per-user, per-month, per-category totals kept in sync with transactions"""
+
+    __tablename__ = "monthly_rollups"
+
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    year = Column(Integer, primary_key=True)
+    month = Column(Integer, primary_key=True)
+    category = Column(String(100), primary_key=True)
+    income_cents = Column(BigInteger, nullable=False, default=0)
+    expense_cents = Column(BigInteger, nullable=False, default=0)  # Positive total
+    count = Column(Integer, nullable=False, default=0)
+    income_count = Column(Integer, nullable=False, default=0)  # Of count
+
+    def __repr__(self):
+        return (
+            f"<MonthlyRollup(user_id={self.user_id}, {self.year}-{self.month:02d}, "
+            f"category='{self.category}', count={self.count})>"
+        )
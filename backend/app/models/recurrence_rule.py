@@ -0,0 +1,61 @@
+# backend/app/models/recurrence_rule.py
+from sqlalchemy import (
+    Column,
+    Integer,
+    BigInteger,
+    String,
+    Date,
+    DateTime,
+    ForeignKey,
+    Text,
+    Index,
+)
+from datetime import datetime
+from decimal import Decimal
+from app.core.database import Base
+from app.utils.money import from_cents
+
+
+class RecurrenceRule(Base):
+    """
+    A transaction template repeated every `interval_months` months on
+    `day_of_month` (clamped to the month's last day), from start_date until
+    end_date. next_date is the next occurrence still to be materialized.
+    """
+
+    __tablename__ = "recurrence_rules"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    amount_cents = Column(BigInteger, nullable=False)  # Signed, like transactions
+    description = Column(String(255), nullable=True)
+    category = Column(String(100), nullable=False)
+    transaction_type = Column(String(20), default="expense")
+    location = Column(String(255), nullable=True)
+    notes = Column(Text, nullable=True)
+    interval_months = Column(Integer, nullable=False, default=1)
+    day_of_month = Column(Integer, nullable=False)
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=True)  # Inclusive; NULL repeats forever
+    next_date = Column(Date, nullable=True)  # NULL once the rule has ended
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
+    updated_at = Column(
+        DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+    __table_args__ = (
+        # The scheduler's "due rules" scan
+        Index("ix_recurrence_rules_next_date_id", next_date, id),
+    )
+
+    @property
+    def amount(self) -> Decimal:
+        return from_cents(self.amount_cents)  # type: ignore
+
+    def __repr__(self):
+        return (
+            f"<RecurrenceRule(id={self.id}, every {self.interval_months} month(s) "
+            f"on day {self.day_of_month}, next={self.next_date})>"
+        )
@@ -1,14 +1,16 @@
 # backend/app/models/transaction.py
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean, Text
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, ForeignKey, Boolean, Text, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime
+from decimal import Decimal
 from app.core.database import Base
+from app.utils.money import to_cents, from_cents
 
 class Transaction(Base):
     __tablename__ = "transactions"
     
     id = Column(Integer, primary_key=True, index=True)
-    amount = Column(Float, nullable=False)
+    amount_cents = Column(BigInteger, nullable=False)  # Signed, exact integer cents
     description = Column(String(255), nullable=True)
     category = Column(String(100), nullable=False)
     date = Column(DateTime(timezone=True), nullable=False)
@@ -17,11 +19,40 @@ class Transaction(Base):
     location = Column(String(255), nullable=True)
     notes = Column(Text, nullable=True)
     is_recurring = Column(Boolean, default=False)
+    # Set on occurrences materialized from a recurrence rule
+    recurrence_rule_id = Column(
+        Integer, ForeignKey("recurrence_rules.id", ondelete="SET NULL"), nullable=True
+    )
     created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
     updated_at = Column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationship
     user = relationship("User", back_populates="transactions")
 
+    __table_args__ = (
+        # Serves the per-user list ordering and keyset pagination
+        Index(
+            "ix_transactions_user_date_created_id",
+            user_id,
+            date.desc(),
+            created_at.desc(),
+            id.desc(),
+        ),
+        # One occurrence per rule and date: the scheduler inserts with
+        # ON CONFLICT DO NOTHING, so reruns never duplicate
+        UniqueConstraint(
+            recurrence_rule_id, date, name="uq_transactions_recurrence_rule_date"
+        ),
+    )
+
+    @property
+    def amount(self) -> Decimal:
+        """Signed amount as a two-decimal Decimal (what the API schemas expect)"""
+        return from_cents(self.amount_cents)  # type: ignore
+
+    @amount.setter
+    def amount(self, value) -> None:
+        self.amount_cents = to_cents(value)
+
     def __repr__(self):
-        return f"<Transaction(id={self.id}, amount={self.amount}, category='{self.category}')>"
\ No newline at end of file
+        return f"<Transaction(id={self.id}, amount={self.amount}, category='{self.category}')>"
@@ -1,9 +1,11 @@
 # backend/app/schemas/transaction.py
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, TypeAdapter, root_validator, validator
 import datetime
-from typing import Optional, Literal
+from typing import List, Optional, Literal
 from decimal import Decimal
 
+from app.utils.dates import to_day
+
 
 class TransactionBase(BaseModel):
     amount: Decimal = Field(
@@ -54,9 +56,98 @@ class TransactionUpdate(BaseModel):
 class TransactionResponse(TransactionBase):
     id: int
     user_id: int
+    recurrence_rule_id: Optional[int] = None
     created_at: datetime.datetime
     updated_at: datetime.datetime
 
+    @validator("date", pre=True)
+    def stored_day(cls, v):
+        # Stored as a timestamp at local midnight; the driver returns it in UTC
+        return to_day(v)
+
+    class Config:
+        from_attributes = True
+
+
+# Validates ORM rows and dumps them straight to JSON bytes (list endpoints)
+TransactionListAdapter = TypeAdapter(List[TransactionResponse])
+
+# Operations per POST /api/transactions/batch (creates + updates + deletes)
+MAX_BATCH_OPERATIONS = 1000
+
+
+class TransactionBatchUpdate(TransactionUpdate):
+    id: int
+
+
+class TransactionBatch(BaseModel):
+    create: List[TransactionCreate] = Field(default_factory=list)
+    update: List[TransactionBatchUpdate] = Field(default_factory=list)
+    delete: List[int] = Field(default_factory=list)
+
+    @root_validator(skip_on_failure=True)
+    def validate_operations(cls, values):
+        update_ids = [item.id for item in values["update"]]
+        ids = update_ids + values["delete"]
+        if len(values["create"]) + len(ids) > MAX_BATCH_OPERATIONS:
+            raise ValueError(f"At most {MAX_BATCH_OPERATIONS} operations per batch")
+        if len(set(ids)) != len(ids):
+            raise ValueError("Each transaction may be updated or deleted only once")
+        return values
+
+
+class TransactionBatchResult(BaseModel):
+    created: List[TransactionResponse]
+    updated: List[TransactionResponse]
+    deleted: List[int]
+
+
+class RecurrenceRuleCreate(BaseModel):
+    amount: Decimal = Field(
+        ..., max_digits=10, decimal_places=2, description="Amount of each occurrence"
+    )
+    description: Optional[str] = Field(None, max_length=255)
+    category: str = Field(..., max_length=100)
+    transaction_type: Literal["income", "expense"] = "expense"
+    location: Optional[str] = Field(None, max_length=255)
+    notes: Optional[str] = Field(None)
+    interval_months: int = Field(1, ge=1, le=12, description="Repeat every N months")
+    day_of_month: Optional[int] = Field(
+        None, ge=1, le=31, description="Defaults to start_date's day; clamped"
+    )
+    start_date: datetime.date = Field(default_factory=datetime.date.today)
+    end_date: Optional[datetime.date] = Field(None, description="Inclusive")
+
+    @validator("amount")
+    def validate_amount(cls, v):
+        if v == 0:
+            raise ValueError("Amount cannot be zero")
+        return v
+
+    @root_validator(skip_on_failure=True)
+    def validate_dates(cls, values):
+        end_date = values.get("end_date")
+        if end_date is not None and end_date < values["start_date"]:
+            raise ValueError("end_date is before start_date")
+        return values
+
+
+class RecurrenceRuleResponse(BaseModel):
+    id: int
+    user_id: int
+    amount: Decimal
+    description: Optional[str]
+    category: str
+    transaction_type: str
+    location: Optional[str]
+    notes: Optional[str]
+    interval_months: int
+    day_of_month: int
+    start_date: datetime.date
+    end_date: Optional[datetime.date]
+    next_date: Optional[datetime.date]
+    created_at: datetime.datetime
+
     class Config:
         from_attributes = True
 
@@ -94,3 +185,42 @@ INCOME_CATEGORIES = [
     "Refund",
     "Other Income",
 ]
+
+# Predefined templates for quick transaction entry
+QUICK_ADD_TEMPLATES = [
+    {
+        "name": "Coffee",
+        "amount": 4.50,
+        "category": "Food & Dining",
+        "description": "Coffee",
+        "transaction_type": "expense",
+    },
+    {
+        "name": "Lunch",
+        "amount": 12.00,
+        "category": "Food & Dining",
+        "description": "Lunch",
+        "transaction_type": "expense",
+    },
+    {
+        "name": "Gas",
+        "amount": 40.00,
+        "category": "Transportation",
+        "description": "Gas fill-up",
+        "transaction_type": "expense",
+    },
+    {
+        "name": "Groceries",
+        "amount": 75.00,
+        "category": "Groceries",
+        "description": "Grocery shopping",
+        "transaction_type": "expense",
+    },
+    {
+        "name": "Salary",
+        "amount": 3000.00,
+        "category": "Salary",
+        "description": "Monthly salary",
+        "transaction_type": "income",
+    },
+]
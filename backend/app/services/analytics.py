@@ -0,0 +1,373 @@
+# backend/app/services/analytics.py
+"""
+Optional in-memory analytics engine (ANALYTICS_ENGINE=numpy; needs numpy).
+
+A user's transactions are loaded once into compact NumPy columns (ids,
+amounts in cents, days since 1970-01-01, dictionary-encoded category and
+location codes - 28 bytes per row) and the dashboard summary, trends and
+breakdowns are computed from them with vectorized operations instead of
+SQL. Results match the SQL paths in dashboard.py, trends.py and
+breakdown.py.
+
+Entries are tagged with the user's data version. Single-row writes patch a
+cached entry in place (sync); anything else - a bulk import, a write this
+process did not see - leaves the entry's version behind, and it is
+reloaded on next use. Total memory is bounded by an LRU across users.
+"""
+import calendar
+import datetime
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Date, cast, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.transaction import Transaction
+from app.services.breakdown import MAX_BREAKDOWN_GROUPS
+from app.services.data_version import get_data_version
+from app.services.trends import bucket_start, iter_buckets, next_bucket
+
+try:
+    import numpy as np
+except ImportError:  # Optional dependency: fall back to the SQL paths
+    np = None
+
+EPOCH = datetime.date(1970, 1, 1)
+
+
+def analytics_enabled() -> bool:
+    return settings.ANALYTICS_ENGINE == "numpy" and np is not None
+
+
+def to_day(value: datetime.date) -> int:
+    return (value - EPOCH).days
+
+
+def from_day(day: int) -> datetime.date:
+    return EPOCH + datetime.timedelta(days=int(day))
+
+
+def row_columns():
+    # Dates cast in SQL, so days fall in the same buckets as date_trunc/rollups
+    return (
+        Transaction.id,
+        Transaction.amount_cents,
+        cast(Transaction.date, Date),
+        Transaction.category,
+        Transaction.location,
+    )
+
+
+class Dictionary:
+    """Dictionary encoding: value <-> small integer code"""
+
+    def __init__(self):
+        self.values: List[Any] = []
+        self.codes: Dict[Any, int] = {}
+
+    def encode(self, value) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class UserColumns:
+    """One user's transactions as parallel NumPy arrays"""
+
+    def __init__(self, rows: Iterable[tuple], version: int):
+        self.version = version
+        self.categories = Dictionary()
+        self.locations = Dictionary()
+        ids, amounts, days, category_codes, location_codes = [], [], [], [], []
+        for id, amount_cents, day, category, location in rows:
+            ids.append(id)
+            amounts.append(amount_cents)
+            days.append(to_day(day))
+            category_codes.append(self.categories.encode(category))
+            location_codes.append(self.locations.encode(location))
+        self.ids = np.array(ids, dtype=np.int64)
+        self.amounts = np.array(amounts, dtype=np.int64)
+        self.days = np.array(days, dtype=np.int32)
+        self.category_codes = np.array(category_codes, dtype=np.int32)
+        self.location_codes = np.array(location_codes, dtype=np.int32)
+
+    @property
+    def nbytes(self) -> int:
+        arrays = (
+            self.ids,
+            self.amounts,
+            self.days,
+            self.category_codes,
+            self.location_codes,
+        )
+        # Dictionary values are short strings; count them roughly
+        dictionaries = 64 * (len(self.categories.values) + len(self.locations.values))
+        return sum(array.nbytes for array in arrays) + dictionaries
+
+    def replace(self, ids: Sequence[int], rows: Iterable[tuple]) -> None:
+        """Drop the given ids, then append their current rows (if any)"""
+        keep = ~np.isin(self.ids, np.asarray(ids, dtype=np.int64))
+        new_ids, amounts, days, category_codes, location_codes = [], [], [], [], []
+        for id, amount_cents, day, category, location in rows:
+            new_ids.append(id)
+            amounts.append(amount_cents)
+            days.append(to_day(day))
+            category_codes.append(self.categories.encode(category))
+            location_codes.append(self.locations.encode(location))
+        self.ids = np.concatenate([self.ids[keep], np.array(new_ids, np.int64)])
+        self.amounts = np.concatenate([self.amounts[keep], np.array(amounts, np.int64)])
+        self.days = np.concatenate([self.days[keep], np.array(days, np.int32)])
+        self.category_codes = np.concatenate(
+            [self.category_codes[keep], np.array(category_codes, np.int32)]
+        )
+        self.location_codes = np.concatenate(
+            [self.location_codes[keep], np.array(location_codes, np.int32)]
+        )
+
+    # --- Bucketing ---
+
+    def bucket_days(self, days, granularity: str):
+        """Start day of each row's bucket (weeks start on Monday)"""
+        if granularity == "day":
+            return days.astype(np.int64)
+        if granularity == "week":
+            # 1970-01-01 was a Thursday
+            return days.astype(np.int64) - (days.astype(np.int64) + 3) % 7
+        dates = days.astype("datetime64[D]")
+        if granularity == "year":
+            years = dates.astype("datetime64[Y]")
+            return years.astype("datetime64[D]").astype(np.int64)
+        months = dates.astype("datetime64[M]").astype(np.int64)
+        if granularity == "quarter":
+            months -= months % 3
+        return months.astype("datetime64[M]").astype("datetime64[D]").astype(np.int64)
+
+    def window(self, start: Optional[datetime.date], end: Optional[datetime.date]):
+        """Boolean mask of rows with start <= day <= end"""
+        mask = np.ones(len(self.ids), dtype=bool)
+        if start is not None:
+            mask &= self.days >= to_day(start)
+        if end is not None:
+            mask &= self.days <= to_day(end)
+        return mask
+
+    # --- Dashboard computations ---
+
+    def summary(self, year: int, month: int) -> Dict[str, Any]:
+        first = datetime.date(year, month, 1)
+        last = next_bucket(first, "month") - datetime.timedelta(days=1)
+        in_month = self.window(first, last)
+        income = self.amounts > 0
+        spent = in_month & ~income
+        spending = np.bincount(
+            self.category_codes[spent],
+            weights=-self.amounts[spent],
+            minlength=len(self.categories.values),
+        )
+        order = np.argsort(-spending, kind="stable")
+        return {
+            "monthly_income": int(self.amounts[in_month & income].sum()),
+            "monthly_expenses": int(-self.amounts[spent].sum()),
+            "total_income": int(self.amounts[income].sum()),
+            "total_expenses": int(-self.amounts[~income].sum()),
+            "total_transactions": len(self.ids),
+            "category_spending": [
+                (self.categories.values[code], int(round(spending[code])))
+                for code in order
+                if spending[code] > 0
+            ],
+        }
+
+    def trend_series(
+        self, start: datetime.date, end: datetime.date, granularity: str
+    ) -> List[Tuple[datetime.date, int, int]]:
+        buckets = list(iter_buckets(start, end, granularity))
+        if granularity in ("month", "quarter"):
+            # Whole months at both ends, like the rollup-backed SQL path
+            start = bucket_start(start, granularity)
+            end = end.replace(day=calendar.monthrange(end.year, end.month)[1])
+        mask = self.window(start, end)
+        amounts = self.amounts[mask]
+        index = np.searchsorted(
+            np.array([to_day(bucket) for bucket in buckets], dtype=np.int64),
+            self.bucket_days(self.days[mask], granularity),
+        )
+        income = np.bincount(
+            index, weights=np.where(amounts > 0, amounts, 0), minlength=len(buckets)
+        )
+        expenses = np.bincount(
+            index, weights=np.where(amounts < 0, -amounts, 0), minlength=len(buckets)
+        )
+        return [
+            (bucket, int(round(income[i])), int(round(expenses[i])))
+            for i, bucket in enumerate(buckets)
+        ]
+
+    def breakdown(
+        self,
+        dimensions: Sequence[str],
+        granularity: str,
+        start: Optional[datetime.date],
+        end: Optional[datetime.date],
+    ) -> Tuple[List[dict], str, bool]:
+        mask = self.window(start, end)
+        amounts = self.amounts[mask]
+        is_income = amounts > 0
+
+        keys = []
+        for dimension in dimensions:
+            if dimension == "category":
+                keys.append(self.category_codes[mask].astype(np.int64))
+            elif dimension == "location":
+                keys.append(self.location_codes[mask].astype(np.int64))
+            elif dimension == "period":
+                keys.append(self.bucket_days(self.days[mask], granularity))
+            else:
+                keys.append(is_income.astype(np.int64))
+
+        if not len(amounts):
+            return [], "memory", False
+        groups_keys, inverse = np.unique(
+            np.stack(keys, axis=1), axis=0, return_inverse=True
+        )
+        inverse = inverse.reshape(-1)
+        count = np.bincount(inverse)
+        income = np.bincount(inverse, weights=np.where(is_income, amounts, 0))
+        expenses = np.bincount(inverse, weights=np.where(is_income, 0, -amounts))
+
+        groups = []
+        for i, codes in enumerate(groups_keys):
+            group: Dict[str, Any] = {}
+            for dimension, code in zip(dimensions, codes):
+                if dimension == "category":
+                    group[dimension] = self.categories.values[code]
+                elif dimension == "location":
+                    group[dimension] = self.locations.values[code]
+                elif dimension == "period":
+                    group[dimension] = from_day(code)
+                else:
+                    group[dimension] = "income" if code else "expense"
+            income_cents = int(round(income[i]))
+            expense_cents = int(round(expenses[i]))
+            group.update(
+                income_cents=income_cents,
+                expense_cents=expense_cents,
+                net_cents=income_cents - expense_cents,
+                count=int(count[i]),
+            )
+            groups.append(group)
+
+        # Same order as SQL: by the other dimensions (NULLs last), then income
+        # before expense
+        ordered = [d for d in dimensions if d != "transaction_type"]
+        groups.sort(
+            key=lambda group: (
+                [(group[d] is None, group[d] or "") for d in ordered],
+                group.get("transaction_type") == "expense",
+            )
+        )
+        truncated = len(groups) > MAX_BREAKDOWN_GROUPS
+        return groups[:MAX_BREAKDOWN_GROUPS], "memory", truncated
+
+
+class AnalyticsCache:
+    """LRU of UserColumns across users, bounded by total bytes"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[int, UserColumns]" = OrderedDict()
+        self._sizes: Dict[int, int] = {}  # Bytes accounted per cached user
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.loads = 0
+        self.syncs = 0
+        self.evictions = 0
+
+    async def columns(self, db: AsyncSession, user_id: int) -> UserColumns:
+        """The user's columns, loading them if missing or stale"""
+        # Read the version first: the load then sees at least that data
+        version = await get_data_version(db, user_id)
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry.version == version:
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry
+
+        result = await db.execute(
+            select(*row_columns()).where(Transaction.user_id == user_id)
+        )
+        entry = UserColumns(result.all(), version)
+        self.loads += 1
+        self._store(user_id, entry)
+        return entry
+
+    async def sync(
+        self, db: AsyncSession, user_id: int, version: int, ids: Sequence[int]
+    ) -> None:
+        """
+        After a committed write to `ids` that bumped the user's data version to
+        `version`: patch a cached entry that was current just before it.
+        """
+        with self._lock:
+            entry = self._entries.get(user_id)
+        if entry is None or entry.version >= version:
+            return
+        if entry.version != version - 1:
+            self.invalidate(user_id)
+            return
+
+        result = await db.execute(
+            select(*row_columns()).where(
+                Transaction.user_id == user_id, Transaction.id.in_(ids)
+            )
+        )
+        rows = result.all()
+        with self._lock:
+            # Another write or a reload may have happened meanwhile
+            if self._entries.get(user_id) is not entry or entry.version != version - 1:
+                return
+        entry.replace(ids, rows)
+        entry.version = version
+        self.syncs += 1
+        self._store(user_id, entry)
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            if self._entries.pop(user_id, None) is not None:
+                self._bytes -= self._sizes.pop(user_id)
+
+    def _store(self, user_id: int, entry: UserColumns) -> None:
+        size = entry.nbytes
+        with self._lock:
+            if self._entries.pop(user_id, None) is not None:
+                self._bytes -= self._sizes.pop(user_id)
+            if size > self.max_bytes:
+                return  # Too big to cache; the caller still uses it once
+            self._entries[user_id] = entry
+            self._sizes[user_id] = size
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                evicted, _ = self._entries.popitem(last=False)
+                self._bytes -= self._sizes.pop(evicted)
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": analytics_enabled(),
+            "users": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "loads": self.loads,
+            "syncs": self.syncs,
+            "evictions": self.evictions,
+        }
+
+
+analytics_cache = AnalyticsCache(max_bytes=settings.ANALYTICS_CACHE_MAX_BYTES)
@@ -0,0 +1,169 @@
+# backend/app/services/batch.py
+"""
+Atomic batches of transaction creates, updates and deletes.
+
+The whole batch is one DB transaction whose statement count depends on the
+number of distinct changes, not on the number of rows:
+
+    SELECT ... FOR UPDATE      ownership check and row locks, all ids at once
+    rollup subtraction         old values of every updated/deleted row
+    INSERT ... RETURNING       all creates, one multi-row statement
+    UPDATE ... RETURNING       one per distinct change (a recategorization of
+                               500 rows is a single UPDATE ... WHERE id IN)
+    DELETE ... RETURNING       all deletes
+    rollup addition            new values of every created/updated row
+
+and the caller commits once. Updates and deletes are also scoped by user_id.
+"""
+import datetime
+from collections import defaultdict
+from typing import Any, Dict, List, Sequence, Tuple
+
+from sqlalchemy import case, delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.transaction import Transaction
+from app.schemas.transaction import TransactionBatch, TransactionBatchUpdate
+from app.services.importer import build_row
+from app.services.recurrence import rule_for_transaction, sync_recurrence
+from app.services.rollups import add_to_rollups, remove_from_rollups
+from app.utils.dates import start_of_day
+from app.utils.money import signed_cents, to_cents
+
+# Fields an update may explicitly set to null; null elsewhere means "unchanged"
+NULLABLE_FIELDS = {"description", "location", "notes"}
+
+
+class MissingTransactions(Exception):
+    """Some ids to update or delete don't exist or belong to another user"""
+
+    def __init__(self, ids: Sequence[int]):
+        super().__init__(f"Transactions not found: {sorted(ids)}")
+        self.ids = sorted(ids)
+
+
+def update_values(item: TransactionBatchUpdate) -> Dict[str, Any]:
+    """
+    Column values for an UPDATE. amount_cents is a SQL expression when it
+    depends on the row's current amount or type.
+    """
+    values = {
+        field: value
+        for field, value in item.dict(exclude_unset=True, exclude={"id"}).items()
+        if value is not None or field in NULLABLE_FIELDS
+    }
+    if values.get("date") is not None:
+        values["date"] = start_of_day(values["date"])
+    amount = values.pop("amount", None)
+    new_type = values.get("transaction_type")
+    if amount is not None and new_type is not None:
+        values["amount_cents"] = signed_cents(amount, new_type)
+    elif amount is not None:
+        # Sign follows the row's current type
+        cents = abs(to_cents(amount))
+        values["amount_cents"] = case(
+            (Transaction.transaction_type == "expense", -cents), else_=cents
+        )
+    elif new_type is not None:
+        magnitude = func.abs(Transaction.amount_cents)
+        values["amount_cents"] = -magnitude if new_type == "expense" else magnitude
+    return values
+
+
+def change_key(item: TransactionBatchUpdate) -> Tuple:
+    """Updates with equal keys are applied by one UPDATE"""
+    changes = item.dict(exclude_unset=True, exclude={"id"})
+    return tuple(sorted(changes.items()))
+
+
+async def apply_batch(
+    db: AsyncSession, user_id: int, batch: TransactionBatch
+) -> Tuple[List[Transaction], List[Transaction], List[int]]:
+    """
+    Apply the batch without committing; returns (created, updated, deleted ids).
+    Raises MissingTransactions before writing anything if an id is not the user's.
+    """
+    ids = [item.id for item in batch.update] + list(batch.delete)
+    if ids:
+        found = set(
+            (
+                await db.execute(
+                    select(Transaction.id)
+                    .where(Transaction.id.in_(ids), Transaction.user_id == user_id)
+                    .with_for_update()
+                )
+            ).scalars()
+        )
+        if len(found) != len(ids):
+            raise MissingTransactions(set(ids) - found)
+
+        # Take the old values out of the rollups before they change
+        await remove_from_rollups(db, ids)
+
+    created: List[Transaction] = []
+    if batch.create:
+        now = datetime.datetime.utcnow()
+        rows, rules = [], []
+        for item in batch.create:
+            row = build_row(item, user_id, now)
+            row["recurrence_rule_id"] = None
+            rows.append(row)
+            if item.is_recurring:
+                rules.append((row, rule_for_transaction(item, user_id)))
+        if rules:
+            db.add_all([rule for _, rule in rules])
+            await db.flush()
+            for row, rule in rules:
+                row["recurrence_rule_id"] = rule.id
+        result = await db.execute(insert(Transaction).returning(Transaction), rows)
+        created = list(result.scalars())
+
+    groups: Dict[Tuple, List[TransactionBatchUpdate]] = defaultdict(list)
+    for item in batch.update:
+        groups[change_key(item)].append(item)
+    updated: List[Transaction] = []
+    for items in groups.values():
+        values = update_values(items[0])
+        if not values:
+            continue
+        result = await db.execute(
+            update(Transaction)
+            .where(
+                Transaction.id.in_([item.id for item in items]),
+                Transaction.user_id == user_id,
+            )
+            .values(**values)
+            .returning(Transaction)
+            .execution_options(synchronize_session=False)
+        )
+        updated.extend(result.scalars())
+    # Updates that change nothing still return their row
+    untouched = {item.id for item in batch.update} - {t.id for t in updated}
+    if untouched:
+        result = await db.execute(
+            select(Transaction).where(Transaction.id.in_(untouched))
+        )
+        updated.extend(result.scalars())
+
+    # is_recurring changes start or stop recurrences, as in update_transaction
+    recurring_changes = {
+        item.id for item in batch.update if "is_recurring" in item.model_fields_set
+    }
+    for transaction in updated:
+        if transaction.id in recurring_changes:
+            await sync_recurrence(db, transaction)
+
+    deleted: List[int] = []
+    if batch.delete:
+        result = await db.execute(
+            delete(Transaction)
+            .where(Transaction.id.in_(batch.delete), Transaction.user_id == user_id)
+            .returning(Transaction.id)
+            .execution_options(synchronize_session=False)
+        )
+        deleted = list(result.scalars())
+
+    await add_to_rollups(
+        db, [t.id for t in created] + [item.id for item in batch.update]
+    )
+    return created, updated, deleted
@@ -0,0 +1,184 @@
+# backend/app/services/breakdown.py
+"""
+Sums, counts and averages of a user's transactions grouped by one or two
+dimensions: category, location, transaction_type and period (a time bucket).
+
+Served from monthly_rollups whenever the rollups hold enough detail: no
+location, month/quarter/year periods, and a window made of whole months.
+Otherwise it falls back to a GROUP BY over the window of transactions
+(a range scan on the (user_id, date, ...) index).
+
+transaction_type follows the amount's sign, as the rollups do (income rows
+are stored positive, expenses negative), so both sources agree. It is never
+grouped on in SQL: each row's income and expense totals are split in Python.
+"""
+import calendar
+import datetime
+from typing import Any, Dict, List, Literal, Optional, Sequence, Tuple
+
+from sqlalchemy import Date, cast, func, literal, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.monthly_rollup import MonthlyRollup
+from app.models.transaction import Transaction
+
+Dimension = Literal["category", "location", "transaction_type", "period"]
+PeriodGranularity = Literal["day", "week", "month", "quarter", "year"]
+
+ROLLUP_DIMENSIONS = {"category", "transaction_type", "period"}
+ROLLUP_GRANULARITIES = {"month", "quarter", "year"}
+
+# Groups returned at most (before splitting by transaction_type)
+MAX_BREAKDOWN_GROUPS = 5000
+
+
+def covers_whole_months(
+    start: Optional[datetime.date], end: Optional[datetime.date]
+) -> bool:
+    if start is not None and start.day != 1:
+        return False
+    if end is not None:
+        return end.day == calendar.monthrange(end.year, end.month)[1]
+    return True
+
+
+def can_use_rollups(
+    dimensions: Sequence[str],
+    granularity: str,
+    start: Optional[datetime.date],
+    end: Optional[datetime.date],
+) -> bool:
+    if not set(dimensions) <= ROLLUP_DIMENSIONS:
+        return False
+    if "period" in dimensions and granularity not in ROLLUP_GRANULARITIES:
+        return False
+    return covers_whole_months(start, end)
+
+
+def _rollup_query(user_id, dimensions, granularity, start, end):
+    columns = []
+    for dimension in dimensions:
+        if dimension == "category":
+            columns.append(MonthlyRollup.category.label("category"))
+        elif dimension == "period":
+            if granularity == "month":
+                month = MonthlyRollup.month
+            elif granularity == "quarter":
+                month = (MonthlyRollup.month - 1) // 3 * 3 + 1
+            else:
+                month = literal(1)
+            period = func.make_date(MonthlyRollup.year, month, 1, type_=Date)
+            columns.append(period.label("period"))
+
+    query = select(
+        *columns,
+        func.sum(MonthlyRollup.income_cents).label("income"),
+        func.sum(MonthlyRollup.expense_cents).label("expenses"),
+        func.sum(MonthlyRollup.count).label("count"),
+        func.sum(MonthlyRollup.income_count).label("income_count"),
+    ).where(MonthlyRollup.user_id == user_id)
+
+    year_month = tuple_(MonthlyRollup.year, MonthlyRollup.month)
+    if start is not None:
+        query = query.where(
+            year_month >= tuple_(literal(start.year), literal(start.month))
+        )
+    if end is not None:
+        query = query.where(year_month <= tuple_(literal(end.year), literal(end.month)))
+    return query, columns
+
+
+def _transaction_query(user_id, dimensions, granularity, start, end):
+    columns = []
+    for dimension in dimensions:
+        if dimension == "category":
+            columns.append(Transaction.category.label("category"))
+        elif dimension == "location":
+            columns.append(Transaction.location.label("location"))
+        elif dimension == "period":
+            columns.append(
+                cast(func.date_trunc(granularity, Transaction.date), Date).label(
+                    "period"
+                )
+            )
+
+    amount = Transaction.amount_cents
+    query = select(
+        *columns,
+        func.coalesce(func.sum(amount).filter(amount > 0), 0).label("income"),
+        func.coalesce(-func.sum(amount).filter(amount < 0), 0).label("expenses"),
+        func.count(Transaction.id).label("count"),
+        func.count(Transaction.id).filter(amount > 0).label("income_count"),
+    ).where(Transaction.user_id == user_id)
+
+    # Date params cast in SQL: compared as local midnight, like date_trunc
+    if start is not None:
+        query = query.where(Transaction.date >= cast(literal(start), Date))
+    if end is not None:
+        day_after_end = end + datetime.timedelta(days=1)
+        query = query.where(Transaction.date < cast(literal(day_after_end), Date))
+    return query, columns
+
+
+def _group(keys: Dict[str, Any], income: int, expenses: int, count: int) -> dict:
+    return {
+        **keys,
+        "income_cents": income,
+        "expense_cents": expenses,
+        "net_cents": income - expenses,
+        "count": count,
+    }
+
+
+async def breakdown(
+    db: AsyncSession,
+    user_id: int,
+    dimensions: Sequence[Dimension],
+    granularity: PeriodGranularity = "month",
+    start: Optional[datetime.date] = None,
+    end: Optional[datetime.date] = None,
+) -> Tuple[List[dict], str, bool]:
+    """
+    Returns (groups, source, truncated). Each group has its dimension values
+    plus income_cents, expense_cents (positive), net_cents and count.
+    """
+    if can_use_rollups(dimensions, granularity, start, end):
+        source = "rollups"
+        query, columns = _rollup_query(user_id, dimensions, granularity, start, end)
+    else:
+        source = "transactions"
+        query, columns = _transaction_query(
+            user_id, dimensions, granularity, start, end
+        )
+
+    if columns:
+        query = query.group_by(*columns).order_by(*columns)
+    rows = (await db.execute(query.limit(MAX_BREAKDOWN_GROUPS + 1))).all()
+    truncated = len(rows) > MAX_BREAKDOWN_GROUPS
+
+    groups = []
+    for row in rows[:MAX_BREAKDOWN_GROUPS]:
+        if not row.count:
+            continue
+        keys = {column.key: getattr(row, column.key) for column in columns}
+        if "transaction_type" not in dimensions:
+            groups.append(_group(keys, row.income, row.expenses, int(row.count)))
+            continue
+        income_count = int(row.income_count)
+        expense_count = int(row.count) - income_count
+        if income_count:
+            groups.append(
+                _group(
+                    {**keys, "transaction_type": "income"}, row.income, 0, income_count
+                )
+            )
+        if expense_count:
+            groups.append(
+                _group(
+                    {**keys, "transaction_type": "expense"},
+                    0,
+                    row.expenses,
+                    expense_count,
+                )
+            )
+    return groups, source, truncated
@@ -0,0 +1,49 @@
+# backend/app/services/data_version.py
+"""
+Per-user data version: users.data_version, bumped by every write to a
+user's transactions. Read caches key on it, so a bump invalidates every
+cached response for that user without tracking what they contained.
+
+The bump runs in the same DB transaction as the write it accounts for, so
+the new version and the new data commit together and every worker sees
+both: a reader that sees the new version also sees the new data. Reading
+it is a primary-key lookup; it is not taken from the authenticated-user
+cache, which may be older.
+"""
+from typing import Iterable
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User
+
+
+async def get_data_version(db: AsyncSession, user_id: int) -> int:
+    result = await db.execute(select(User.data_version).where(User.id == user_id))
+    return result.scalar_one_or_none() or 0
+
+
+async def bump_data_version(db: AsyncSession, user_id: int) -> int:
+    """Increment the user's version before committing a write; returns it"""
+    result = await db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(data_version=User.data_version + 1)
+        .returning(User.data_version)
+        .execution_options(synchronize_session=False)
+    )
+    return result.scalar_one()
+
+
+async def bump_data_versions(db: AsyncSession, user_ids: Iterable[int]) -> None:
+    """bump_data_version for several users, locking their rows in id order"""
+    ids = sorted(set(user_ids))
+    if not ids:
+        return
+    locked = select(User.id).where(User.id.in_(ids)).order_by(User.id).with_for_update()
+    await db.execute(
+        update(User)
+        .where(User.id.in_(locked))
+        .values(data_version=User.data_version + 1)
+        .execution_options(synchronize_session=False)
+    )
@@ -0,0 +1,104 @@
+# backend/app/services/exporter.py
+"""
+Streaming transaction export (CSV / NDJSON).
+
+Rows are read through a server-side cursor (stream + yield_per) and encoded a
+chunk at a time, so memory stays flat regardless of how many rows a user has.
+"""
+import csv
+import io
+import json
+from typing import AsyncIterator
+
+from sqlalchemy import Date, Select, cast, desc
+
+from app.core.database import AsyncSessionLocal
+from app.models.transaction import Transaction
+from app.utils.money import from_cents
+
+EXPORT_CHUNK_ROWS = 1000
+
+EXPORT_FIELDS = [
+    "id",
+    "date",
+    "amount",
+    "transaction_type",
+    "category",
+    "description",
+    "location",
+    "notes",
+    "is_recurring",
+    "created_at",
+]
+
+
+def export_query(base: Select) -> Select:
+    """Narrow a filtered Transaction query to the exported columns"""
+    return base.with_only_columns(
+        Transaction.id,
+        # Calendar day in SQL, like the rollups and analytics (the driver
+        # returns timestamptz in UTC, which may be a different day)
+        cast(Transaction.date, Date).label("day"),
+        Transaction.amount_cents,
+        Transaction.transaction_type,
+        Transaction.category,
+        Transaction.description,
+        Transaction.location,
+        Transaction.notes,
+        Transaction.is_recurring,
+        Transaction.created_at,
+    ).order_by(desc(Transaction.date), desc(Transaction.created_at), desc(Transaction.id))
+
+
+def row_values(row) -> list:
+    return [
+        row.id,
+        row.day.isoformat() if row.day else None,
+        str(from_cents(row.amount_cents)),
+        row.transaction_type,
+        row.category,
+        row.description,
+        row.location,
+        row.notes,
+        bool(row.is_recurring),
+        row.created_at.isoformat() if row.created_at else None,
+    ]
+
+
+def encode_csv(rows, header: bool) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_FIELDS)
+    writer.writerows(row_values(row) for row in rows)
+    return buffer.getvalue()
+
+
+def encode_ndjson(rows) -> str:
+    return "".join(
+        json.dumps(dict(zip(EXPORT_FIELDS, row_values(row))), ensure_ascii=False) + "\n"
+        for row in rows
+    )
+
+
+async def stream_export(query: Select, format: str) -> AsyncIterator[bytes]:
+    """
+    Yield the encoded export in chunks.
+
+    Uses its own session: the request-scoped one is closed before a
+    StreamingResponse body is sent.
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(
+            export_query(query).execution_options(yield_per=EXPORT_CHUNK_ROWS)
+        )
+        first = True
+        async for partition in result.partitions():
+            if format == "csv":
+                yield encode_csv(partition, header=first).encode()
+            else:
+                yield encode_ndjson(partition).encode()
+            first = False
+
+        if first and format == "csv":
+            yield encode_csv([], header=True).encode()
@@ -0,0 +1,245 @@
+# backend/app/services/importer.py
+"""
+Streaming bank-statement import (CSV / NDJSON).
+
+The upload is consumed chunk by chunk, parsed into records, validated against
+TransactionCreate in batches and written with one multi-row INSERT per batch,
+so memory stays bounded by the batch size rather than the file size. A line
+or CSV record longer than IMPORT_MAX_RECORD_BYTES (no newline, or a quote
+that never closes) is reported as a failed row and skipped up to the next
+newline instead of being buffered.
+
+Imported rows keep is_recurring as a flag only and start no recurrence rule:
+a statement already lists every past occurrence, so a rule per flagged row
+would multiply them. Recurrences are set up through /api/recurring, or by
+creating or updating a transaction with is_recurring.
+"""
+import csv
+import datetime
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.transaction import Transaction
+from app.schemas.transaction import TransactionCreate
+from app.services.data_version import bump_data_version
+from app.services.rollups import add_to_rollups
+from app.utils.dates import start_of_day
+from app.utils.money import signed_cents
+
+IMPORT_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+# (row number, parsed record or None, parse error or None)
+Record = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+
+def oversized_error(max_record_bytes: int) -> str:
+    return f"Record exceeds {max_record_bytes} bytes"
+
+
+async def iter_lines(
+    chunks: AsyncIterator[bytes], max_record_bytes: Optional[int] = None
+) -> AsyncIterator[Optional[str]]:
+    """
+    Split a byte stream into decoded lines. A line longer than
+    max_record_bytes is dropped up to its newline and yielded as None.
+    """
+    max_record_bytes = max_record_bytes or settings.IMPORT_MAX_RECORD_BYTES
+    # A UTF-8 newline byte is never part of a multi-byte character, so
+    # splitting before decoding is safe
+    pending = bytearray()
+    oversized = False
+    async for chunk in chunks:
+        start = 0
+        newline = chunk.find(b"\n")
+        while newline != -1:
+            if oversized:
+                yield None
+                oversized = False
+            else:
+                pending += chunk[start : newline + 1]
+                if len(pending) > max_record_bytes:
+                    yield None
+                else:
+                    yield pending.decode("utf-8-sig", errors="replace")
+            pending.clear()
+            start = newline + 1
+            newline = chunk.find(b"\n", start)
+        if not oversized:
+            pending += chunk[start:]
+            if len(pending) > max_record_bytes:
+                oversized = True
+                pending.clear()
+    if oversized:
+        yield None
+    elif pending:
+        yield pending.decode("utf-8-sig", errors="replace")
+
+
+async def iter_csv_records(
+    lines: AsyncIterator[Optional[str]], max_record_bytes: Optional[int] = None
+) -> AsyncIterator[Record]:
+    """
+    Yield CSV rows as dicts keyed by the header row. A record (quoted fields
+    may span lines) longer than max_record_bytes is reported and dropped;
+    parsing resumes at the next line.
+    """
+    max_record_bytes = max_record_bytes or settings.IMPORT_MAX_RECORD_BYTES
+    header: Optional[List[str]] = None
+    buffer: List[str] = []
+    size = quotes = 0
+    row_number = 0
+
+    async for line in lines:
+        if line is not None:
+            size += len(line.encode())
+        if line is None or size > max_record_bytes:
+            row_number += 1
+            yield row_number, None, oversized_error(max_record_bytes)
+            buffer, size, quotes = [], 0, 0
+            continue
+
+        buffer.append(line)
+        quotes += line.count('"')
+        if quotes % 2:
+            continue  # Quoted field continues on the next line
+
+        text, buffer, size, quotes = "".join(buffer), [], 0, 0
+        if not text.strip():
+            continue
+        values = next(csv.reader([text]))
+
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+
+        row_number += 1
+        if len(values) != len(header):
+            yield row_number, None, f"Expected {len(header)} columns, got {len(values)}"
+            continue
+        # Empty cells mean "not provided" so schema defaults apply
+        yield row_number, {
+            key: value for key, value in zip(header, values) if value.strip() != ""
+        }, None
+
+    if buffer:
+        yield row_number + 1, None, "Unterminated quoted field"
+
+
+async def iter_ndjson_records(
+    lines: AsyncIterator[Optional[str]], max_record_bytes: Optional[int] = None
+) -> AsyncIterator[Record]:
+    """Yield one JSON object per non-empty line"""
+    max_record_bytes = max_record_bytes or settings.IMPORT_MAX_RECORD_BYTES
+    row_number = 0
+    async for line in lines:
+        if line is None:
+            row_number += 1
+            yield row_number, None, oversized_error(max_record_bytes)
+            continue
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield row_number, None, f"Invalid JSON: {e.msg}"
+            continue
+        if not isinstance(record, dict):
+            yield row_number, None, "Expected a JSON object"
+            continue
+        yield row_number, record, None
+
+
+def build_row(transaction: TransactionCreate, user_id: int, now: datetime.datetime):
+    """Column values for a core INSERT of one validated transaction"""
+    return {
+        "user_id": user_id,
+        "amount_cents": signed_cents(transaction.amount, transaction.transaction_type),
+        "description": transaction.description,
+        "category": transaction.category,
+        "date": start_of_day(transaction.date),
+        "transaction_type": transaction.transaction_type,
+        "location": transaction.location,
+        "notes": transaction.notes,
+        "is_recurring": transaction.is_recurring,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def validate_batch(
+    records: List[Record], user_id: int
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Validate parsed records; return (insert rows, per-row errors)"""
+    now = datetime.datetime.utcnow()
+    rows, errors = [], []
+    for row_number, record, parse_error in records:
+        if parse_error is not None:
+            errors.append({"row": row_number, "errors": [parse_error]})
+            continue
+        try:
+            transaction = TransactionCreate(**record)  # type: ignore[arg-type]
+        except ValidationError as e:
+            errors.append(
+                {
+                    "row": row_number,
+                    "errors": [
+                        f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}"
+                        for err in e.errors()
+                    ],
+                }
+            )
+            continue
+        rows.append(build_row(transaction, user_id, now))
+    return rows, errors
+
+
+async def insert_batch(db: AsyncSession, rows: List[Dict[str, Any]]) -> List[int]:
+    """Multi-row INSERT of a batch, keeping the monthly rollups in step"""
+    if not rows:
+        return []
+    result = await db.execute(insert(Transaction).returning(Transaction.id), rows)
+    ids = list(result.scalars())
+    await add_to_rollups(db, ids)
+    return ids
+
+
+async def import_transactions(
+    db: AsyncSession, records: AsyncIterator[Record], user_id: int
+) -> Dict[str, Any]:
+    """Validate and insert a stream of records in batches; commit once at the end"""
+    processed = imported = failed = 0
+    errors: List[Dict[str, Any]] = []
+    batch: List[Record] = []
+
+    async def flush_batch():
+        nonlocal imported, failed
+        rows, batch_errors = validate_batch(batch, user_id)
+        imported += len(await insert_batch(db, rows))
+        failed += len(batch_errors)
+        errors.extend(batch_errors[: max(0, MAX_REPORTED_ERRORS - len(errors))])
+        batch.clear()
+
+    async for record in records:
+        processed += 1
+        batch.append(record)
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            await flush_batch()
+    await flush_batch()
+
+    if imported:
+        await bump_data_version(db, user_id)
+    await db.commit()
+    return {
+        "processed": processed,
+        "imported": imported,
+        "failed": failed,
+        "errors": errors,
+        "errors_truncated": failed > len(errors),
+    }
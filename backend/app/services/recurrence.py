@@ -0,0 +1,285 @@
+# backend/app/services/recurrence.py
+"""
+Materialization of recurring transactions from recurrence_rules.
+
+A background task started in the app lifespan (recurrence_scheduler) calls
+materialize_due every RECURRENCE_SCHEDULER_INTERVAL_SECONDS. Each pass claims
+due rules in batches with SELECT ... FOR UPDATE SKIP LOCKED, so several
+workers split the rules between them instead of queueing on the same rows.
+For each batch it:
+
+    inserts every occurrence up to today with one multi-row INSERT ...
+        ON CONFLICT (recurrence_rule_id, date) DO NOTHING
+    adds the inserted rows to the monthly rollups
+    advances the rules' next_date (one bulk UPDATE by primary key)
+    bumps the affected users' data versions, and commits
+
+A crash or error before the commit rolls the batch back and the next pass
+redoes it; the unique constraint turns any rerun over already-materialized
+dates into a no-op. Occurrences are never duplicated, across restarts or
+workers.
+"""
+import asyncio
+import calendar
+import contextlib
+import datetime
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.logger import logger
+from app.models.recurrence_rule import RecurrenceRule
+from app.models.transaction import Transaction
+from app.schemas.transaction import RecurrenceRuleCreate, TransactionCreate
+from app.services.analytics import analytics_cache
+from app.services.data_version import bump_data_versions
+from app.services.rollups import add_to_rollups
+from app.utils.dates import start_of_day, to_day
+from app.utils.money import signed_cents
+
+
+def occurrence_in(year: int, month: int, day_of_month: int) -> datetime.date:
+    """day_of_month in the given month, clamped to its last day"""
+    last_day = calendar.monthrange(year, month)[1]
+    return datetime.date(year, month, min(day_of_month, last_day))
+
+
+def add_months(day: datetime.date, months: int, day_of_month: int) -> datetime.date:
+    month_index = day.year * 12 + day.month - 1 + months
+    return occurrence_in(month_index // 12, month_index % 12 + 1, day_of_month)
+
+
+def first_occurrence(
+    start_date: datetime.date,
+    interval_months: int,
+    day_of_month: int,
+    end_date: Optional[datetime.date],
+) -> Optional[datetime.date]:
+    """First occurrence on or after start_date (None if past end_date)"""
+    first = occurrence_in(start_date.year, start_date.month, day_of_month)
+    if first < start_date:
+        first = add_months(first, interval_months, day_of_month)
+    if end_date is not None and first > end_date:
+        return None
+    return first
+
+
+def due_occurrences(
+    next_date: datetime.date,
+    interval_months: int,
+    day_of_month: int,
+    end_date: Optional[datetime.date],
+    today: datetime.date,
+) -> Tuple[List[datetime.date], Optional[datetime.date]]:
+    """(occurrences up to today, the rule's new next_date or None once it ends)"""
+    dates: List[datetime.date] = []
+    day: Optional[datetime.date] = next_date
+    while day is not None and day <= today:
+        dates.append(day)
+        day = add_months(day, interval_months, day_of_month)
+        if end_date is not None and day > end_date:
+            day = None
+    return dates, day
+
+
+def new_rule(data: RecurrenceRuleCreate, user_id: int) -> RecurrenceRule:
+    day_of_month = data.day_of_month or data.start_date.day
+    return RecurrenceRule(
+        user_id=user_id,
+        amount_cents=signed_cents(data.amount, data.transaction_type),
+        description=data.description,
+        category=data.category,
+        transaction_type=data.transaction_type,
+        location=data.location,
+        notes=data.notes,
+        interval_months=data.interval_months,
+        day_of_month=day_of_month,
+        start_date=data.start_date,
+        end_date=data.end_date,
+        next_date=first_occurrence(
+            data.start_date, data.interval_months, day_of_month, data.end_date
+        ),
+    )
+
+
+def rule_for_transaction(
+    transaction: TransactionCreate, user_id: int
+) -> RecurrenceRule:
+    """Monthly rule on the transaction's day; the transaction is its first occurrence"""
+    rule = new_rule(
+        RecurrenceRuleCreate(
+            amount=transaction.amount,
+            description=transaction.description,
+            category=transaction.category,
+            transaction_type=transaction.transaction_type,
+            location=transaction.location,
+            notes=transaction.notes,
+            start_date=transaction.date,
+        ),
+        user_id,
+    )
+    rule.next_date = add_months(transaction.date, 1, transaction.date.day)
+    return rule
+
+
+async def sync_recurrence(db: AsyncSession, transaction: Transaction) -> None:
+    """
+    Start or stop the recurrence a transaction's is_recurring flag asks for,
+    after it was changed by an update. Turning it on starts a monthly rule
+    with the transaction as first occurrence; turning it off deletes the
+    rule (occurrences already created are kept).
+    """
+    if transaction.is_recurring and transaction.recurrence_rule_id is None:
+        day = to_day(transaction.date)
+        rule = rule_for_transaction(
+            TransactionCreate(
+                amount=abs(transaction.amount),
+                description=transaction.description,
+                category=transaction.category,
+                date=day,
+                transaction_type=transaction.transaction_type,
+                location=transaction.location,
+                notes=transaction.notes,
+                is_recurring=True,
+            ),
+            transaction.user_id,  # type: ignore
+        )
+        db.add(rule)
+        await db.flush()
+        transaction.recurrence_rule_id = rule.id
+    elif not transaction.is_recurring and transaction.recurrence_rule_id is not None:
+        await db.execute(
+            delete(RecurrenceRule).where(
+                RecurrenceRule.id == transaction.recurrence_rule_id
+            )
+        )
+        transaction.recurrence_rule_id = None  # type: ignore
+
+
+def occurrence_row(rule, day: datetime.date, now: datetime.datetime) -> dict:
+    """Column values for a core INSERT of one occurrence"""
+    return {
+        "user_id": rule.user_id,
+        "amount_cents": rule.amount_cents,
+        "description": rule.description,
+        "category": rule.category,
+        "date": start_of_day(day),
+        "transaction_type": rule.transaction_type,
+        "location": rule.location,
+        "notes": rule.notes,
+        "is_recurring": True,
+        "recurrence_rule_id": rule.id,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+async def materialize_due(
+    db: AsyncSession, today: datetime.date, batch_size: Optional[int] = None
+) -> Dict[str, int]:
+    """Insert every due occurrence of every rule, one commit per batch of rules"""
+    batch_size = batch_size or settings.RECURRENCE_BATCH_SIZE
+    rules_done = created = 0
+
+    while True:
+        due = (
+            await db.execute(
+                select(
+                    RecurrenceRule.id,
+                    RecurrenceRule.user_id,
+                    RecurrenceRule.amount_cents,
+                    RecurrenceRule.description,
+                    RecurrenceRule.category,
+                    RecurrenceRule.transaction_type,
+                    RecurrenceRule.location,
+                    RecurrenceRule.notes,
+                    RecurrenceRule.interval_months,
+                    RecurrenceRule.day_of_month,
+                    RecurrenceRule.end_date,
+                    RecurrenceRule.next_date,
+                )
+                .where(RecurrenceRule.next_date <= today)
+                .order_by(RecurrenceRule.next_date, RecurrenceRule.id)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            )
+        ).all()
+        if not due:
+            break
+
+        now = datetime.datetime.utcnow()
+        rows, advanced = [], []
+        for rule in due:
+            dates, next_date = due_occurrences(
+                rule.next_date,
+                rule.interval_months,
+                rule.day_of_month,
+                rule.end_date,
+                today,
+            )
+            rows.extend(occurrence_row(rule, day, now) for day in dates)
+            advanced.append({"id": rule.id, "next_date": next_date})
+
+        inserted = []
+        if rows:
+            result = await db.execute(
+                insert(Transaction)
+                .on_conflict_do_nothing(
+                    constraint="uq_transactions_recurrence_rule_date"
+                )
+                .returning(Transaction.id, Transaction.user_id),
+                rows,
+            )
+            inserted = result.all()
+            await add_to_rollups(db, [row.id for row in inserted])
+        await db.execute(update(RecurrenceRule), advanced)
+        user_ids = {row.user_id for row in inserted}
+        await bump_data_versions(db, user_ids)
+        await db.commit()
+
+        for user_id in user_ids:
+            analytics_cache.invalidate(user_id)
+
+        rules_done += len(due)
+        created += len(inserted)
+        if len(due) < batch_size:
+            break
+
+    return {"rules": rules_done, "created": created}
+
+
+async def run_scheduler(interval_seconds: float) -> None:
+    """Materialize due occurrences every interval_seconds, until cancelled"""
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                result = await materialize_due(db, datetime.date.today())
+            if result["created"]:
+                logger.info(
+                    "Recurring transactions: %(created)d created from %(rules)d rules",
+                    result,
+                )
+        except Exception:
+            logger.exception("Recurring transaction pass failed")
+        await asyncio.sleep(interval_seconds)
+
+
+@contextlib.asynccontextmanager
+async def recurrence_scheduler() -> AsyncIterator[None]:
+    """Run the scheduler in the background for the duration of the block"""
+    if not settings.RECURRENCE_SCHEDULER_ENABLED:
+        yield
+        return
+    task = asyncio.create_task(
+        run_scheduler(settings.RECURRENCE_SCHEDULER_INTERVAL_SECONDS)
+    )
+    try:
+        yield
+    finally:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
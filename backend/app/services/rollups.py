@@ -0,0 +1,99 @@
+# backend/app/services/rollups.py
+"""
+Incremental maintenance of the monthly_rollups table.
+
+Deltas are computed in SQL from the transaction rows themselves, so the
+year/month bucket always matches what Postgres (and the rebuild) would derive
+from the stored timestamp. Call these inside the same DB transaction as the
+write they account for:
+
+    add_to_rollups       after the rows are inserted/updated (and flushed)
+    remove_from_rollups  before the rows are updated/deleted
+"""
+from typing import Iterable, Optional
+
+from sqlalchemy import Integer, cast, delete, extract, func, literal, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.monthly_rollup import MonthlyRollup
+from app.models.transaction import Transaction
+
+ROLLUP_COLUMNS = [
+    "user_id",
+    "year",
+    "month",
+    "category",
+    "income_cents",
+    "expense_cents",
+    "count",
+    "income_count",
+]
+
+
+def rollup_source(sign: int = 1):
+    """SELECT producing rollup rows (scaled by sign) from transactions"""
+    year = cast(extract("year", Transaction.date), Integer)
+    month = cast(extract("month", Transaction.date), Integer)
+    amount = Transaction.amount_cents
+    return select(
+        Transaction.user_id,
+        year,
+        month,
+        Transaction.category,
+        literal(sign) * func.coalesce(func.sum(amount).filter(amount > 0), 0),
+        literal(-sign) * func.coalesce(func.sum(amount).filter(amount < 0), 0),
+        literal(sign) * func.count(Transaction.id),
+        literal(sign) * func.count(Transaction.id).filter(amount > 0),
+    ).group_by(Transaction.user_id, year, month, Transaction.category)
+
+
+def rollup_upsert(source):
+    """INSERT ... SELECT that adds the source rows onto existing rollups"""
+    stmt = insert(MonthlyRollup).from_select(ROLLUP_COLUMNS, source)
+    return stmt.on_conflict_do_update(
+        index_elements=["user_id", "year", "month", "category"],
+        set_={
+            "income_cents": MonthlyRollup.income_cents + stmt.excluded.income_cents,
+            "expense_cents": MonthlyRollup.expense_cents
+            + stmt.excluded.expense_cents,
+            "count": MonthlyRollup.count + stmt.excluded.count,
+            "income_count": MonthlyRollup.income_count + stmt.excluded.income_count,
+        },
+    )
+
+
+async def add_to_rollups(db: AsyncSession, transaction_ids: Iterable[int]) -> None:
+    """Add the given (already flushed) transactions to their monthly rollups"""
+    ids = list(transaction_ids)
+    if not ids:
+        return
+    await db.execute(rollup_upsert(rollup_source(1).where(Transaction.id.in_(ids))))
+
+
+async def remove_from_rollups(db: AsyncSession, transaction_ids: Iterable[int]) -> None:
+    """Subtract the given transactions from their rollups (before changing them)"""
+    ids = list(transaction_ids)
+    if not ids:
+        return
+    source = rollup_source(-1).where(Transaction.id.in_(ids))
+    await db.execute(rollup_upsert(source))
+
+    # Drop buckets that no longer contain any transaction
+    user_ids = select(Transaction.user_id).where(Transaction.id.in_(ids))
+    await db.execute(
+        delete(MonthlyRollup).where(
+            MonthlyRollup.user_id.in_(user_ids), MonthlyRollup.count <= 0
+        )
+    )
+
+
+def rebuild_statements(user_id: Optional[int] = None):
+    """(DELETE, INSERT) pair that recomputes rollups from scratch"""
+    clear = delete(MonthlyRollup)
+    source = rollup_source(1)
+    if user_id is not None:
+        clear = clear.where(MonthlyRollup.user_id == user_id)
+        source = source.where(Transaction.user_id == user_id)
+    fill = insert(MonthlyRollup).from_select(ROLLUP_COLUMNS, source)
+    return clear, fill
@@ -0,0 +1,158 @@
+# backend/app/services/trends.py
+"""
+Income/expense series over a date window, bucketed by day, week, month or
+quarter, with empty buckets filled with zeros.
+
+month and quarter are summed from monthly_rollups (a primary-key range scan,
+at most 12 rows per category per year). day and week are bucketed with
+date_trunc over the user's transactions in the window, which the
+(user_id, date, ...) index serves as a range scan. Either way only the
+window is read, never the whole history.
+"""
+import datetime
+from typing import Dict, Iterator, List, Literal, Tuple
+
+from sqlalchemy import Date, and_, cast, func, literal, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.monthly_rollup import MonthlyRollup
+from app.models.transaction import Transaction
+
+Granularity = Literal["day", "week", "month", "quarter"]
+
+# About ten years of daily buckets
+MAX_TREND_BUCKETS = 4000
+
+
+def bucket_start(day: datetime.date, granularity: Granularity) -> datetime.date:
+    """First day of the bucket containing day (weeks start on Monday, like Postgres)"""
+    if granularity == "day":
+        return day
+    if granularity == "week":
+        return day - datetime.timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day.replace(month=(day.month - 1) // 3 * 3 + 1, day=1)
+
+
+def next_bucket(start: datetime.date, granularity: Granularity) -> datetime.date:
+    if granularity == "day":
+        return start + datetime.timedelta(days=1)
+    if granularity == "week":
+        return start + datetime.timedelta(weeks=1)
+    months = 1 if granularity == "month" else 3
+    month_index = start.year * 12 + start.month - 1 + months
+    return datetime.date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def iter_buckets(
+    start: datetime.date, end: datetime.date, granularity: Granularity
+) -> Iterator[datetime.date]:
+    """Start dates of every bucket overlapping [start, end]"""
+    bucket = bucket_start(start, granularity)
+    last = bucket_start(end, granularity)
+    while bucket <= last:
+        yield bucket
+        if bucket == last:  # The bucket after it may be past date.max
+            return
+        bucket = next_bucket(bucket, granularity)
+
+
+def months_back(end: datetime.date, months: int) -> datetime.date:
+    """First day of the month `months - 1` months before end's month"""
+    month_index = end.year * 12 + end.month - 1 - (max(months, 1) - 1)
+    return datetime.date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def count_buckets(
+    start: datetime.date, end: datetime.date, granularity: Granularity
+) -> int:
+    first = bucket_start(start, granularity)
+    last = bucket_start(end, granularity)
+    if granularity == "day":
+        return (last - first).days + 1
+    if granularity == "week":
+        return (last - first).days // 7 + 1
+    months = (last.year - first.year) * 12 + last.month - first.month
+    return months // (1 if granularity == "month" else 3) + 1
+
+
+async def _monthly_totals(
+    db: AsyncSession, user_id: int, start: datetime.date, end: datetime.date
+) -> Dict[datetime.date, Tuple[int, int]]:
+    year_month = tuple_(MonthlyRollup.year, MonthlyRollup.month)
+    rows = await db.execute(
+        select(
+            MonthlyRollup.year,
+            MonthlyRollup.month,
+            func.sum(MonthlyRollup.income_cents).label("income"),
+            func.sum(MonthlyRollup.expense_cents).label("expenses"),
+        )
+        .where(
+            MonthlyRollup.user_id == user_id,
+            year_month >= tuple_(literal(start.year), literal(start.month)),
+            year_month <= tuple_(literal(end.year), literal(end.month)),
+        )
+        .group_by(MonthlyRollup.year, MonthlyRollup.month)
+    )
+    return {
+        datetime.date(int(row.year), int(row.month), 1): (row.income, row.expenses)
+        for row in rows
+    }
+
+
+async def _truncated_totals(
+    db: AsyncSession,
+    user_id: int,
+    start: datetime.date,
+    end: datetime.date,
+    granularity: Granularity,
+) -> Dict[datetime.date, Tuple[int, int]]:
+    amount = Transaction.amount_cents
+    bucket = cast(func.date_trunc(granularity, Transaction.date), Date)
+    # Date params cast in SQL: compared as local midnight, like date_trunc
+    in_window = Transaction.date >= cast(literal(start), Date)
+    if end < datetime.date.max:
+        day_after_end = end + datetime.timedelta(days=1)
+        in_window = and_(
+            in_window, Transaction.date < cast(literal(day_after_end), Date)
+        )
+    rows = await db.execute(
+        select(
+            bucket.label("bucket"),
+            func.coalesce(func.sum(amount).filter(amount > 0), 0).label("income"),
+            func.coalesce(-func.sum(amount).filter(amount < 0), 0).label("expenses"),
+        )
+        .where(Transaction.user_id == user_id, in_window)
+        .group_by(bucket)
+    )
+    return {row.bucket: (row.income, row.expenses) for row in rows}
+
+
+async def trend_series(
+    db: AsyncSession,
+    user_id: int,
+    start: datetime.date,
+    end: datetime.date,
+    granularity: Granularity = "month",
+) -> List[Tuple[datetime.date, int, int]]:
+    """
+    (bucket_start, income_cents, expense_cents) for every bucket overlapping
+    [start, end], oldest first, zero-filled. Month and quarter buckets cover
+    whole months; day and week buckets only count transactions in the window.
+    """
+    if granularity in ("month", "quarter"):
+        first = bucket_start(start, granularity)
+        monthly = await _monthly_totals(db, user_id, first, end)
+        totals: Dict[datetime.date, Tuple[int, int]] = {}
+        for month, (income, expenses) in monthly.items():
+            key = bucket_start(month, granularity)
+            previous = totals.get(key, (0, 0))
+            totals[key] = (previous[0] + income, previous[1] + expenses)
+    else:
+        totals = await _truncated_totals(db, user_id, start, end, granularity)
+
+    return [
+        (bucket, *totals.get(bucket, (0, 0)))
+        for bucket in iter_buckets(start, end, granularity)
+    ]
@@ -0,0 +1,34 @@
+# backend/app/utils/dates.py
+"""
+Calendar days <-> transactions.date (timestamptz).
+
+A day is stored as midnight in DB_TIMEZONE, which is also the session
+TimeZone of both engines, so SQL casts and date_trunc (rollups, trends,
+export, analytics) put every row on the day it was entered. asyncpg returns
+timestamptz values in UTC; to_day converts them back to that day.
+"""
+import datetime
+from typing import Optional, Union
+from zoneinfo import ZoneInfo
+
+from app.core.config import settings
+
+DB_TIMEZONE = ZoneInfo(settings.DB_TIMEZONE)
+
+
+def start_of_day(day: datetime.date) -> datetime.datetime:
+    """Timezone-aware midnight of day, as stored in transactions.date"""
+    if isinstance(day, datetime.datetime):
+        day = to_day(day)
+    return datetime.datetime.combine(day, datetime.time(), DB_TIMEZONE)
+
+
+def to_day(
+    value: Optional[Union[datetime.date, datetime.datetime]],
+) -> Optional[datetime.date]:
+    """The calendar day of a stored timestamp (dates pass through)"""
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(DB_TIMEZONE)
+        return value.date()
+    return value
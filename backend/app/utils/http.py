@@ -0,0 +1,62 @@
+# backend/app/utils/http.py
+import hashlib
+from typing import Any, Dict, Optional
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
+
+# For content that only changes with a deploy; the ETag covers the rest
+STATIC_CACHE_CONTROL = "public, max-age=86400"
+
+
+def render_json(content: Any) -> bytes:
+    """Encode content exactly as the app's default response class would."""
+    return ORJSONResponse(jsonable_encoder(content)).body
+
+
+def etag_for(body: bytes) -> str:
+    """Strong ETag derived from the response body."""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match check (weak comparison, as RFC 9110 requires for it)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag for candidate in header.split(",")
+    )
+
+
+def etag_response(
+    request: Request,
+    body: bytes,
+    etag: str,
+    *,
+    cache_control: str = "private, no-cache",
+    media_type: str = "application/json",
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """200 with the body, or an empty 304 when the client already has it."""
+    headers = {**(headers or {}), "ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+class PrecomputedJSON:
+    """JSON content that never changes at runtime, encoded once."""
+
+    def __init__(self, content: Any, cache_control: str = STATIC_CACHE_CONTROL):
+        self.body = render_json(content)
+        self.etag = etag_for(self.body)
+        self.cache_control = cache_control
+
+    def response(self, request: Request) -> Response:
+        return etag_response(
+            request, self.body, self.etag, cache_control=self.cache_control
+        )
@@ -0,0 +1,23 @@
+# backend/app/utils/money.py
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Union
+
+CENTS = Decimal("0.01")
+
+
+def to_cents(amount: Union[Decimal, int, float, str]) -> int:
+    """Convert a money amount to integer cents (half-up rounding)"""
+    if not isinstance(amount, Decimal):
+        amount = Decimal(str(amount))
+    return int((amount * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def from_cents(cents: Union[int, Decimal, None]) -> Decimal:
+    """Convert integer cents back to a two-decimal Decimal amount"""
+    return (Decimal(int(cents or 0)) / 100).quantize(CENTS)
+
+
+def signed_cents(amount: Union[Decimal, int, float, str], transaction_type: str) -> int:
+    """Cents with the sign implied by the type: expenses negative, income positive"""
+    cents = abs(to_cents(amount))
+    return -cents if transaction_type == "expense" else cents
@@ -0,0 +1,27 @@
+# backend/app/utils/pagination.py
+import base64
+import datetime
+import json
+from typing import Tuple
+
+
+def encode_cursor(date: datetime.datetime, created_at: datetime.datetime, id: int) -> str:
+    """Encode the sort key of the last row on a page into an opaque cursor."""
+    payload = json.dumps(
+        [date.isoformat(), created_at.isoformat(), id], separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime.datetime, datetime.datetime, int]:
+    """Decode a cursor produced by encode_cursor. Raises ValueError if malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        date, created_at, id = json.loads(base64.urlsafe_b64decode(padded))
+        return (
+            datetime.datetime.fromisoformat(date),
+            datetime.datetime.fromisoformat(created_at),
+            int(id),
+        )
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
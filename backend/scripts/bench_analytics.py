@@ -0,0 +1,117 @@
+# backend/scripts/bench_analytics.py
+"""
+Dashboard computations through SQL against the in-memory NumPy engine
+(app/services/analytics.py), for a user with many rows.
+
+Seeds --rows transactions for --user-id like bench_breakdown.py, checks both
+engines agree, times each, and rolls everything back. Needs numpy and a
+reachable PostgreSQL database (same .env as the app).
+
+    python scripts/bench_analytics.py --user-id 1 --rows 200000
+"""
+import argparse
+import asyncio
+import datetime
+import os
+import statistics
+import sys
+import time
+
+# Add the backend directory to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from app.api.dashboard import summary_figures  # noqa: E402
+from app.core.database import AsyncSessionLocal  # noqa: E402
+from app.services.analytics import AnalyticsCache  # noqa: E402
+from app.services.breakdown import breakdown  # noqa: E402
+from app.services.trends import trend_series  # noqa: E402
+from bench_breakdown import seed  # noqa: E402
+
+TODAY = datetime.date(2024, 12, 31)
+YEAR_AGO = datetime.date(2024, 1, 1)
+
+
+async def timed(func, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        if asyncio.iscoroutine(result):
+            result = await result
+        timings.append(time.perf_counter() - start)
+    return result, statistics.median(timings)
+
+
+async def main(user_id: int, rows: int, repeat: int):
+    cache = AnalyticsCache(max_bytes=1 << 30)
+    async with AsyncSessionLocal() as db:
+        await seed(db, user_id, rows)
+
+        start = time.perf_counter()
+        columns = await cache.columns(db, user_id)
+        print(
+            f"Loaded {rows:,} rows into {columns.nbytes / 1e6:.1f} MB "
+            f"in {time.perf_counter() - start:.2f}s\n"
+        )
+
+        cases = [
+            (
+                "summary",
+                lambda: summary_figures(db, user_id, TODAY.year, TODAY.month),
+                lambda: columns.summary(TODAY.year, TODAY.month),
+            ),
+            (
+                "trends/day (1 year)",
+                lambda: trend_series(db, user_id, YEAR_AGO, TODAY, "day"),
+                lambda: columns.trend_series(YEAR_AGO, TODAY, "day"),
+            ),
+            (
+                "trends/month (1 year)",
+                lambda: trend_series(db, user_id, YEAR_AGO, TODAY, "month"),
+                lambda: columns.trend_series(YEAR_AGO, TODAY, "month"),
+            ),
+            (
+                "breakdown category+period/week",
+                lambda: breakdown(db, user_id, ("category", "period"), "week"),
+                lambda: columns.breakdown(("category", "period"), "week", None, None),
+            ),
+            (
+                "breakdown location+type",
+                lambda: breakdown(db, user_id, ("location", "transaction_type")),
+                lambda: columns.breakdown(
+                    ("location", "transaction_type"), "month", None, None
+                ),
+            ),
+        ]
+        for label, sql, memory in cases:
+            expected, sql_time = await timed(sql, repeat)
+            result, memory_time = await timed(memory, repeat)
+            if isinstance(expected, tuple):  # breakdown: compare the groups only
+                expected, result = expected[0], result[0]
+            agree = "ok" if _comparable(expected) == _comparable(result) else "DIFFER"
+            print(
+                f"{label:<32} sql {sql_time * 1000:7.1f}ms  "
+                f"numpy {memory_time * 1000:7.1f}ms  "
+                f"({sql_time / memory_time:5.1f}x)  {agree}"
+            )
+
+        await db.rollback()
+
+
+def _comparable(value):
+    # Group order within equal SQL sort keys is unspecified, and SQL sums
+    # are Decimals: compare the groups as sorted strings
+    if isinstance(value, list) and value and isinstance(value[0], dict):
+        return sorted(str({k: str(v) for k, v in group.items()}) for group in value)
+    if isinstance(value, dict):
+        return {**value, "category_spending": sorted(value["category_spending"])}
+    return value
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the analytics engine")
+    parser.add_argument("--user-id", type=int, required=True)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.user_id, args.rows, args.repeat))
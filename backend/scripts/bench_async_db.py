@@ -0,0 +1,88 @@
+# backend/scripts/bench_async_db.py
+"""
+Compare concurrent-request latency for an `async def` route that runs a
+blocking sync Session query (the old pattern) against the same route using
+the asyncpg-backed AsyncSession.
+
+Needs a reachable PostgreSQL database (same .env as the app).
+
+    python scripts/bench_async_db.py --requests 50 --sleep 0.05
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+# Add the backend directory to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from app.core.database import get_async_db, get_db  # noqa: E402
+
+QUERY = text("SELECT pg_sleep(:seconds)")
+
+
+def build_app(sleep_seconds: float) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/sync-session")
+    async def sync_session_route(db: Session = Depends(get_db)):
+        # Blocks the event loop for the duration of the query
+        db.execute(QUERY, {"seconds": sleep_seconds})
+        return {"ok": True}
+
+    @app.get("/async-session")
+    async def async_session_route(db: AsyncSession = Depends(get_async_db)):
+        await db.execute(QUERY, {"seconds": sleep_seconds})
+        return {"ok": True}
+
+    return app
+
+
+async def run_batch(client: httpx.AsyncClient, path: str, count: int):
+    async def one():
+        start = time.perf_counter()
+        response = await client.get(path)
+        response.raise_for_status()
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    latencies = await asyncio.gather(*(one() for _ in range(count)))
+    return time.perf_counter() - start, sorted(latencies)
+
+
+def report(label: str, wall: float, latencies):
+    p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)]
+    print(
+        f"{label:<15} wall={wall * 1000:8.1f}ms  "
+        f"p50={statistics.median(latencies) * 1000:8.1f}ms  "
+        f"p95={p95 * 1000:8.1f}ms  max={latencies[-1] * 1000:8.1f}ms"
+    )
+
+
+async def main(requests: int, sleep_seconds: float):
+    app = build_app(sleep_seconds)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Warm up both pools
+        await run_batch(client, "/sync-session", 2)
+        await run_batch(client, "/async-session", 2)
+
+        print(f"{requests} concurrent requests, query time {sleep_seconds * 1000:.0f}ms")
+        report("sync Session", *await run_batch(client, "/sync-session", requests))
+        report("AsyncSession", *await run_batch(client, "/async-session", requests))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--sleep", type=float, default=0.05)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.sleep))
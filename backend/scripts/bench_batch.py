@@ -0,0 +1,97 @@
+# backend/scripts/bench_batch.py
+"""
+Recategorizing and deleting --rows transactions: one request-style round
+per row (SELECT, rollups, UPDATE/DELETE, commit - what N calls to
+update_transaction/delete_transaction do) against a single apply_batch.
+
+Runs inside one outer transaction that is rolled back (commits become
+savepoints). Needs a reachable PostgreSQL database (same .env as the app).
+
+    python scripts/bench_batch.py --user-id 1 --rows 500
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Add the backend directory to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from app.api.tracker.routes import get_user_transaction  # noqa: E402
+from app.core.database import async_engine  # noqa: E402
+from app.schemas.transaction import TransactionBatch  # noqa: E402
+from app.services.batch import apply_batch  # noqa: E402
+from app.services.importer import insert_batch, validate_batch  # noqa: E402
+from app.services.rollups import add_to_rollups, remove_from_rollups  # noqa: E402
+from bench_breakdown import make_records  # noqa: E402
+
+
+async def one_by_one(db, user_id: int, update_ids, delete_ids):
+    for transaction_id in update_ids:
+        transaction = await get_user_transaction(
+            db, transaction_id, user_id, for_update=True
+        )
+        await remove_from_rollups(db, [transaction_id])
+        transaction.category = "Shopping"
+        await db.flush()
+        await add_to_rollups(db, [transaction_id])
+        await db.commit()
+    for transaction_id in delete_ids:
+        transaction = await get_user_transaction(
+            db, transaction_id, user_id, for_update=True
+        )
+        await remove_from_rollups(db, [transaction_id])
+        await db.delete(transaction)
+        await db.commit()
+
+
+async def batched(db, user_id: int, update_ids, delete_ids):
+    batch = TransactionBatch(
+        update=[{"id": i, "category": "Shopping"} for i in update_ids],
+        delete=delete_ids,
+    )
+    await apply_batch(db, user_id, batch)
+    await db.commit()
+
+
+async def main(user_id: int, rows: int):
+    async with async_engine.connect() as connection:
+        outer = await connection.begin()
+        db = AsyncSession(
+            bind=connection,
+            join_transaction_mode="create_savepoint",
+            expire_on_commit=False,
+        )
+
+        # Two sets of rows: one per strategy
+        insert_rows = validate_batch(list(make_records(rows * 2)), user_id)[0]
+        ids = await insert_batch(db, insert_rows)
+        await db.commit()
+        half = rows // 2
+        sets = [ids[:rows], ids[rows:]]
+
+        for label, strategy, row_ids in (
+            ("one by one", one_by_one, sets[0]),
+            ("batch", batched, sets[1]),
+        ):
+            start = time.perf_counter()
+            await strategy(db, user_id, row_ids[:half], row_ids[half:])
+            elapsed = time.perf_counter() - start
+            print(
+                f"{label:<12} {half:,} updates + {rows - half:,} deletes  "
+                f"{elapsed * 1000:8.1f}ms"
+            )
+
+        await db.close()
+        await outer.rollback()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark batch mutations")
+    parser.add_argument("--user-id", type=int, required=True)
+    parser.add_argument("--rows", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main(args.user_id, args.rows))
@@ -0,0 +1,107 @@
+# backend/scripts/bench_breakdown.py
+"""
+Latency of /api/dashboard/breakdown queries for a user with many rows.
+
+Inserts --rows transactions for --user-id (through the import path, so the
+rollups are maintained), times each group-by combination, and rolls
+everything back. Needs a reachable PostgreSQL database (same .env as the app).
+
+    python scripts/bench_breakdown.py --user-id 1 --rows 200000
+"""
+import argparse
+import asyncio
+import datetime
+import os
+import random
+import statistics
+import sys
+import time
+
+# Add the backend directory to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from app.core.database import AsyncSessionLocal  # noqa: E402
+from app.schemas.transaction import EXPENSE_CATEGORIES, INCOME_CATEGORIES  # noqa: E402
+from app.services.breakdown import breakdown  # noqa: E402
+from app.services.importer import (  # noqa: E402
+    IMPORT_BATCH_SIZE,
+    insert_batch,
+    validate_batch,
+)
+
+LOCATIONS = ["Vilnius", "Kaunas", "Klaipėda", "Online", None]
+
+# (group_by, granularity, from, to)
+CASES = [
+    (("category",), "month", None, None),
+    (("period",), "month", None, None),
+    (("category", "period"), "quarter", None, None),
+    (("transaction_type", "period"), "year", None, None),
+    (("category",), "month", datetime.date(2023, 1, 1), datetime.date(2023, 12, 31)),
+    (("category",), "month", datetime.date(2023, 1, 15), datetime.date(2023, 12, 15)),
+    (("location", "transaction_type"), "month", None, None),
+    (("category", "period"), "week", datetime.date(2024, 1, 1), None),
+]
+
+
+def make_records(count: int):
+    start = datetime.date(2015, 1, 1)
+    for i in range(count):
+        income = i % 20 == 0
+        categories = INCOME_CATEGORIES if income else EXPENSE_CATEGORIES
+        record = {
+            "date": start + datetime.timedelta(days=i % 3650),
+            "amount": f"{random.uniform(1, 500):.2f}",
+            "category": random.choice(categories),
+            "location": random.choice(LOCATIONS),
+            "transaction_type": "income" if income else "expense",
+        }
+        # (row number, record, parse error), as the import parsers yield them
+        yield i + 1, record, None
+
+
+async def seed(db, user_id: int, rows: int):
+    batch = []
+    for record in make_records(rows):
+        batch.append(record)
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            await insert_batch(db, validate_batch(batch, user_id)[0])
+            batch.clear()
+    if batch:
+        await insert_batch(db, validate_batch(batch, user_id)[0])
+    await db.flush()
+
+
+async def main(user_id: int, rows: int, repeat: int):
+    async with AsyncSessionLocal() as db:
+        start = time.perf_counter()
+        await seed(db, user_id, rows)
+        print(f"Seeded {rows:,} rows in {time.perf_counter() - start:.1f}s\n")
+
+        for dimensions, granularity, date_from, date_to in CASES:
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                groups, source, _ = await breakdown(
+                    db, user_id, dimensions, granularity, date_from, date_to
+                )
+                timings.append(time.perf_counter() - start)
+            label = "+".join(dimensions)
+            if "period" in dimensions:
+                label += f"/{granularity}"
+            window = f"{date_from or '…'}..{date_to or '…'}"
+            print(
+                f"{label:<32} {window:<24} {source:<12} {len(groups):>6} groups  "
+                f"median {statistics.median(timings) * 1000:7.1f}ms"
+            )
+
+        await db.rollback()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark dashboard breakdowns")
+    parser.add_argument("--user-id", type=int, required=True)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.user_id, args.rows, args.repeat))
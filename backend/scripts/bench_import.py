@@ -0,0 +1,111 @@
+# backend/scripts/bench_import.py
+"""
+Throughput (rows/second) of the bulk import pipeline.
+
+Parsing + validation runs without a database. Pass --user-id to also insert
+the rows for that user; the insert run is rolled back afterwards.
+
+    python scripts/bench_import.py --rows 100000
+    python scripts/bench_import.py --rows 100000 --user-id 1
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import random
+import sys
+import time
+
+# Add the backend directory to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from app.schemas.transaction import EXPENSE_CATEGORIES  # noqa: E402
+from app.services.importer import (  # noqa: E402
+    IMPORT_BATCH_SIZE,
+    insert_batch,
+    iter_csv_records,
+    iter_lines,
+    iter_ndjson_records,
+    validate_batch,
+)
+
+FIELDS = ["date", "amount", "category", "description", "transaction_type"]
+
+
+def make_rows(count: int):
+    start = datetime.date(2020, 1, 1)
+    for i in range(count):
+        yield {
+            "date": (start + datetime.timedelta(days=i % 2000)).isoformat(),
+            "amount": f"{random.uniform(1, 500):.2f}",
+            "category": random.choice(EXPENSE_CATEGORIES),
+            "description": f"Card payment #{i}",
+            "transaction_type": "expense",
+        }
+
+
+def make_payload(count: int, fmt: str) -> bytes:
+    if fmt == "csv":
+        lines = [",".join(FIELDS)]
+        lines += [",".join(row[f] for f in FIELDS) for row in make_rows(count)]
+    else:
+        lines = [json.dumps(row) for row in make_rows(count)]
+    return ("\n".join(lines) + "\n").encode()
+
+
+async def chunked(payload: bytes, size: int = 64 * 1024):
+    for i in range(0, len(payload), size):
+        yield payload[i : i + size]
+
+
+async def run(payload: bytes, fmt: str, user_id, db=None):
+    lines = iter_lines(chunked(payload))
+    records = iter_csv_records(lines) if fmt == "csv" else iter_ndjson_records(lines)
+    batch, total = [], 0
+
+    async def flush():
+        nonlocal total
+        rows, _ = validate_batch(batch, user_id or 0)
+        if db is not None:
+            await insert_batch(db, rows)
+        total += len(rows)
+        batch.clear()
+
+    async for record in records:
+        batch.append(record)
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            await flush()
+    await flush()
+    return total
+
+
+async def main(rows: int, user_id):
+    for fmt in ("csv", "ndjson"):
+        payload = make_payload(rows, fmt)
+
+        start = time.perf_counter()
+        total = await run(payload, fmt, user_id)
+        elapsed = time.perf_counter() - start
+        print(f"{fmt:<7} parse+validate: {total / elapsed:>10,.0f} rows/s")
+
+        if user_id is None:
+            continue
+
+        from app.core.database import AsyncSessionLocal
+
+        async with AsyncSessionLocal() as db:
+            start = time.perf_counter()
+            total = await run(payload, fmt, user_id, db)
+            await db.flush()
+            elapsed = time.perf_counter() - start
+            await db.rollback()
+        print(f"{fmt:<7} with INSERT:     {total / elapsed:>10,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the bulk import path")
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--user-id", type=int, default=None)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.user_id))
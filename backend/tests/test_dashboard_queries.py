@@ -0,0 +1,83 @@
+# backend/tests/test_dashboard_queries.py
+"""Number of DB round trips per /api/dashboard/summary request"""
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from starlette.requests import Request
+
+from app.api import dashboard
+
+
+class FakeResult:
+    def one(self):
+        return SimpleNamespace(
+            monthly_income=0,
+            monthly_expenses=0,
+            total_income=0,
+            total_expenses=0,
+            total_transactions=0,
+        )
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return []
+
+
+class CountingSession:
+    """Stands in for AsyncSession and records every statement executed"""
+
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, statement, *args, **kwargs):
+        self.statements.append(statement)
+        return FakeResult()
+
+
+def make_request() -> Request:
+    scope = {"type": "http", "method": "GET", "headers": [], "query_string": b""}
+    return Request(scope)
+
+
+@pytest.fixture(autouse=True)
+def sql_engine(monkeypatch):
+    monkeypatch.setattr(dashboard.settings, "ANALYTICS_ENGINE", "sql")
+    dashboard.dashboard_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_summary_runs_three_queries():
+    # Scalar totals (one conditional aggregate), recent five, category breakdown
+    db = CountingSession()
+    body = await dashboard.build_summary(db, 1, datetime(2025, 10, 15))
+
+    assert len(db.statements) == 3
+    assert body["overall_summary"]["total_transactions"] == 0
+
+
+@pytest.mark.asyncio
+async def test_scalar_totals_are_one_query_over_rollups():
+    db = CountingSession()
+    await dashboard.build_summary(db, 1, datetime(2025, 10, 15))
+
+    totals = str(db.statements[0])
+    assert "monthly_rollups" in totals
+    assert totals.count("sum(") == 5
+
+
+@pytest.mark.asyncio
+async def test_cached_summary_runs_no_queries():
+    db = CountingSession()
+    key = ("summary", 1, 0, 2025, 10)
+
+    def build():
+        return dashboard.build_summary(db, 1, datetime(2025, 10, 15))
+
+    first = await dashboard.cached_response(make_request(), key, build)
+    second = await dashboard.cached_response(make_request(), key, build)
+
+    assert len(db.statements) == 3
+    assert first.body == second.body
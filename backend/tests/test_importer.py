@@ -0,0 +1,91 @@
+# backend/tests/test_importer.py
+"""Streaming CSV / NDJSON parsing for /api/transactions/import"""
+import pytest
+
+from app.services.importer import iter_csv_records, iter_lines, iter_ndjson_records
+
+
+async def chunked(payload: bytes, size: int):
+    for i in range(0, len(payload), size):
+        yield payload[i : i + size]
+
+
+async def parse(parser, payload: bytes, chunk_size: int = 7, max_record_bytes=None):
+    lines = iter_lines(chunked(payload, chunk_size), max_record_bytes)
+    return [record async for record in parser(lines, max_record_bytes)]
+
+
+async def collect_lines(payload: bytes, chunk_size: int, max_record_bytes: int):
+    lines = iter_lines(chunked(payload, chunk_size), max_record_bytes)
+    return [line async for line in lines]
+
+
+@pytest.mark.asyncio
+async def test_lines_split_across_chunks_and_multibyte_characters():
+    payload = "\ufeffa,b\ncafé,ü\nlast".encode()
+    assert await collect_lines(payload, 1, 100) == ["a,b\n", "café,ü\n", "last"]
+
+
+@pytest.mark.asyncio
+async def test_long_line_is_replaced_by_none_and_skipped_to_its_newline():
+    payload = b"short\n" + b"x" * 50 + b"\nnext\n" + b"y" * 50
+    assert await collect_lines(payload, 8, 16) == ["short\n", None, "next\n", None]
+
+
+@pytest.mark.asyncio
+async def test_csv_records_keyed_by_header():
+    payload = b"amount,category,notes\n12.50,Shopping,\n3,Food & Dining,lunch\n"
+    assert await parse(iter_csv_records, payload) == [
+        (1, {"amount": "12.50", "category": "Shopping"}, None),
+        (2, {"amount": "3", "category": "Food & Dining", "notes": "lunch"}, None),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_csv_quoted_field_spanning_lines():
+    payload = b'amount,notes\n5,"first line\nsecond, ""quoted"" line"\n6,plain\n'
+    assert await parse(iter_csv_records, payload) == [
+        (1, {"amount": "5", "notes": 'first line\nsecond, "quoted" line'}, None),
+        (2, {"amount": "6", "notes": "plain"}, None),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_csv_column_count_mismatch():
+    records = await parse(iter_csv_records, b"amount,category\n1,Shopping,extra\n")
+    assert records == [(1, None, "Expected 2 columns, got 3")]
+
+
+@pytest.mark.asyncio
+async def test_csv_unterminated_quote_at_end_of_file():
+    records = await parse(iter_csv_records, b'amount,notes\n1,ok\n2,"never closed\n')
+    assert records == [
+        (1, {"amount": "1", "notes": "ok"}, None),
+        (2, None, "Unterminated quoted field"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_csv_unterminated_quote_is_bounded_and_parsing_resumes():
+    payload = b'amount,notes\n1,"never closed\n' + b"filler\n" * 10 + b"2,after\n"
+    records = await parse(iter_csv_records, payload, max_record_bytes=40)
+    assert records[0] == (1, None, "Record exceeds 40 bytes")
+    assert records[-1][1] == {"amount": "2", "notes": "after"}
+
+
+@pytest.mark.asyncio
+async def test_csv_line_without_newline_is_bounded():
+    payload = b"amount,notes\n" + b"9" * 1000
+    records = await parse(iter_csv_records, payload, max_record_bytes=64)
+    assert records == [(1, None, "Record exceeds 64 bytes")]
+
+
+@pytest.mark.asyncio
+async def test_ndjson_records_and_errors():
+    long_line = b'{"notes": "' + b"x" * 100 + b'"}\n'
+    payload = b'{"amount": 1}\n\n[1, 2]\n{"amount": \n' + long_line
+    records = await parse(iter_ndjson_records, payload, max_record_bytes=32)
+    assert records[0] == (1, {"amount": 1}, None)
+    assert records[1] == (2, None, "Expected a JSON object")
+    assert records[2][0] == 3 and records[2][2].startswith("Invalid JSON")
+    assert records[3] == (4, None, "Record exceeds 32 bytes")
@@ -0,0 +1,132 @@
+# backend/tests/test_transaction_rollups.py
+"""
+monthly_rollups stay equal to a rebuild after concurrent updates and deletes.
+
+Needs a reachable PostgreSQL database (same .env as the app); skipped
+otherwise. Creates a throwaway user and removes it afterwards.
+"""
+import asyncio
+import datetime
+import uuid
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from sqlalchemy import delete, select
+
+from app.api.tracker import routes
+from app.core.database import AsyncSessionLocal, async_engine
+from app.models.monthly_rollup import MonthlyRollup
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.schemas.transaction import TransactionCreate, TransactionUpdate
+from app.services.rollups import rollup_source
+
+WRITERS = 4  # Concurrent requests per transaction
+ROWS = 5
+
+
+async def call(route, user_id: int, *args):
+    """Run a route handler in its own session, like a separate request"""
+    async with AsyncSessionLocal() as db:
+        return await route(*args, db=db, current_user=SimpleNamespace(id=user_id))
+
+
+async def rollups_and_rebuild(user_id: int):
+    async with AsyncSessionLocal() as db:
+        stored = await db.execute(
+            select(
+                MonthlyRollup.user_id,
+                MonthlyRollup.year,
+                MonthlyRollup.month,
+                MonthlyRollup.category,
+                MonthlyRollup.income_cents,
+                MonthlyRollup.expense_cents,
+                MonthlyRollup.count,
+                MonthlyRollup.income_count,
+            ).where(MonthlyRollup.user_id == user_id)
+        )
+        rebuilt = await db.execute(
+            rollup_source(1).where(Transaction.user_id == user_id)
+        )
+        return set(map(tuple, stored.all())), set(map(tuple, rebuilt.all()))
+
+
+@pytest_asyncio.fixture
+async def user_id():
+    try:
+        async with async_engine.connect():
+            pass
+    except Exception as e:  # No database here
+        pytest.skip(f"PostgreSQL not reachable: {e}")
+
+    async with AsyncSessionLocal() as db:
+        user = User(email=f"rollups-{uuid.uuid4()}@test.invalid", hashed_password="x")
+        db.add(user)
+        await db.commit()
+        user_id = user.id
+    try:
+        yield user_id
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(Transaction).where(Transaction.user_id == user_id))
+            await db.execute(
+                delete(MonthlyRollup).where(MonthlyRollup.user_id == user_id)
+            )
+            await db.execute(delete(User).where(User.id == user_id))
+            await db.commit()
+        await async_engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_updates_and_deletes_keep_rollups_exact(user_id):
+    created = [
+        await call(
+            routes.create_transaction,
+            user_id,
+            TransactionCreate(
+                amount=Decimal("1.00"),
+                category="Food & Dining",
+                date=datetime.date(2025, 1, 15),
+                transaction_type="expense",
+            ),
+        )
+        for _ in range(ROWS)
+    ]
+    ids = [t.id for t in created]
+
+    await asyncio.gather(
+        *(
+            call(
+                routes.update_transaction,
+                user_id,
+                transaction_id,
+                TransactionUpdate(amount=Decimal(f"{i + 2}.00"), category="Shopping"),
+            )
+            for transaction_id in ids
+            for i in range(WRITERS)
+        )
+    )
+    stored, rebuilt = await rollups_and_rebuild(user_id)
+    assert stored == rebuilt
+
+    # Half the rows are deleted, each by several racing requests
+    doomed = ids[: ROWS // 2]
+    results = await asyncio.gather(
+        *(
+            call(routes.delete_transaction, user_id, transaction_id)
+            for transaction_id in doomed
+            for _ in range(WRITERS)
+        ),
+        return_exceptions=True,
+    )
+    not_found = [
+        r for r in results if isinstance(r, HTTPException) and r.status_code == 404
+    ]
+    assert len(not_found) == len(doomed) * (WRITERS - 1)
+    assert len(results) - len(not_found) == len(doomed)
+
+    stored, rebuilt = await rollups_and_rebuild(user_id)
+    assert stored == rebuilt
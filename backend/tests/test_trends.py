@@ -0,0 +1,90 @@
+# backend/tests/test_trends.py
+"""Bucket arithmetic behind /api/dashboard/monthly-trends"""
+from datetime import date
+
+import pytest
+
+from app.services.trends import (
+    bucket_start,
+    count_buckets,
+    iter_buckets,
+    months_back,
+    next_bucket,
+)
+
+
+@pytest.mark.parametrize(
+    "granularity, expected",
+    [
+        ("day", date(2025, 8, 14)),
+        ("week", date(2025, 8, 11)),  # Monday
+        ("month", date(2025, 8, 1)),
+        ("quarter", date(2025, 7, 1)),
+    ],
+)
+def test_bucket_start(granularity, expected):
+    assert bucket_start(date(2025, 8, 14), granularity) == expected
+
+
+@pytest.mark.parametrize(
+    "start, granularity, expected",
+    [
+        (date(2024, 2, 28), "day", date(2024, 2, 29)),
+        (date(2025, 12, 29), "week", date(2026, 1, 5)),
+        (date(2025, 12, 1), "month", date(2026, 1, 1)),
+        (date(2025, 10, 1), "quarter", date(2026, 1, 1)),
+    ],
+)
+def test_next_bucket_rolls_over(start, granularity, expected):
+    assert next_bucket(start, granularity) == expected
+
+
+def test_iter_buckets_covers_partial_ends():
+    buckets = list(iter_buckets(date(2025, 2, 15), date(2025, 8, 1), "quarter"))
+    assert buckets == [date(2025, 1, 1), date(2025, 4, 1), date(2025, 7, 1)]
+    assert len(buckets) == count_buckets(date(2025, 2, 15), date(2025, 8, 1), "quarter")
+
+
+def test_iter_buckets_single_day():
+    assert list(iter_buckets(date(2025, 3, 5), date(2025, 3, 5), "day")) == [
+        date(2025, 3, 5)
+    ]
+
+
+def test_iter_buckets_empty_when_start_after_end():
+    assert list(iter_buckets(date(2025, 3, 6), date(2025, 3, 5), "day")) == []
+
+
+@pytest.mark.parametrize("granularity", ["day", "week", "month", "quarter"])
+def test_iter_buckets_stops_at_date_max(granularity):
+    start = date(9999, 11, 15)
+    buckets = list(iter_buckets(start, date.max, granularity))
+    assert buckets[0] == bucket_start(start, granularity)
+    assert buckets[-1] == bucket_start(date.max, granularity)
+    assert len(buckets) == count_buckets(start, date.max, granularity)
+
+
+def test_iter_buckets_from_date_min():
+    assert list(iter_buckets(date.min, date(1, 3, 1), "month")) == [
+        date(1, 1, 1),
+        date(1, 2, 1),
+        date(1, 3, 1),
+    ]
+
+
+@pytest.mark.parametrize(
+    "end, months, expected",
+    [
+        (date(2025, 8, 14), 1, date(2025, 8, 1)),
+        (date(2025, 8, 14), 6, date(2025, 3, 1)),
+        (date(2025, 2, 28), 12, date(2024, 3, 1)),
+        (date(2025, 8, 14), 0, date(2025, 8, 1)),  # At least the current month
+    ],
+)
+def test_months_back(end, months, expected):
+    assert months_back(end, months) == expected
+
+
+def test_months_back_before_year_one():
+    with pytest.raises(ValueError):
+        months_back(date(1, 6, 1), 7)